@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 import logging
 
@@ -39,14 +40,28 @@ except Exception:  # pragma: no cover
 
 # ---------- helpers ----------
 
+@lru_cache(maxsize=131072)
 def _rarity(word: str) -> float:
     z = zipf_frequency(word, "en")
     z = max(0.0, min(8.0, z))
     return (8.0 - z) / 8.0
 
 
+def _pron_for(text: str):
+    # phrase_to_pron only differs from _get_pron for multi-token text; for a
+    # single token it would just repeat the same (missed) lookup
+    if len(text.split()) > 1:
+        return _get_pron(text) or phrase_to_pron(text)
+    return _get_pron(text)
+
+
 def _prosody_str_from_pron(pron):
-    p = pron or []
+    return _prosody_str(tuple(pron or ()))
+
+
+@lru_cache(maxsize=131072)
+def _prosody_str(p: tuple) -> str:
+    # keyed by pron: the same words recur across buckets and repeat searches
     syls = syllable_count(p)
     stress = stress_pattern_str(p)  # e.g. 1-0 or 1-1-0
     meter = metrical_name(stress) if stress else "—"
@@ -102,7 +117,7 @@ def do_search(*args):
     log.debug("Search request word=%s phrase=%s rhyme_types=%s", word, phrase, selected_labels)
 
     # quick header summary for the query word
-    q_pron = _get_pron(word) or phrase_to_pron(word)
+    q_pron = _pron_for(word)
     q_syl = syllable_count(q_pron) if q_pron else 0
     q_stress = stress_pattern_str(q_pron) if q_pron else ""
     q_metre = metrical_name(q_stress) if q_stress else "—"
@@ -128,7 +143,7 @@ def do_search(*args):
         if typ not in allowed_rhyme_types:
             continue
         if _rarity(disp) >= rarity_min:
-            pr = _get_pron(disp) or phrase_to_pron(disp)
+            pr = _pron_for(disp)
             uncommon.append([disp, _prosody_str_from_pron(pr)])
         if len(uncommon) >= 20:
             break
@@ -142,7 +157,7 @@ def do_search(*args):
         typ = str(s.get("type") or "").lower()
         if typ and typ not in allowed_rhyme_types:
             continue
-        pr = _get_pron(n) or phrase_to_pron(n)
+        pr = _pron_for(n)
         slant_rows.append([n, _prosody_str_from_pron(pr), s.get("type","")])
 
     multi_rows = []
@@ -153,7 +168,7 @@ def do_search(*args):
         typ = str(m.get("type") or "").lower()
         if typ and typ not in allowed_rhyme_types:
             continue
-        pr = _get_pron(n) or phrase_to_pron(n)
+        pr = _pron_for(n)
         multi_rows.append([n, _prosody_str_from_pron(pr)])
 
     # Row 2: patterns DB — uses PHRASE if user provided, otherwise WORD
@@ -165,7 +180,7 @@ def do_search(*args):
             for d in enriched:
                 # pick best display word (target > source)
                 w = (d.get("target") or d.get("source") or "").strip()
-                pr = _get_pron(w) or phrase_to_pron(w)
+                pr = _pron_for(w)
                 patterns_rows.append([w, _prosody_str_from_pron(pr), d.get("artist",""), d.get("song",""), (d.get("context","") or "")[:400]])
         except Exception:
             patterns_rows = []
@@ -9,6 +9,7 @@ from collections import Counter, defaultdict
 from pathlib import Path
 
 from rhyme_core.logging_utils import setup_logging
+from rhyme_core.util import parse_set
 
 setup_logging()
 log = logging.getLogger(__name__)
@@ -20,11 +21,6 @@ BUCKET_COLS = {
     "rap":      "rap_items",
 }
 
-def parse_set(cell: str):
-    if not cell:
-        return set()
-    return set(s.strip() for s in cell.split("|") if s.strip())
-
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--csv", default="results/benchmark.csv")
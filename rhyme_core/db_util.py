@@ -0,0 +1,64 @@
+"""SQLite helpers shared by the offline build/migration scripts."""
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterable, List, Tuple
+
+
+def tune(con: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply bulk-write PRAGMAs to a freshly opened connection.
+
+    WAL with synchronous=NORMAL turns commits into sequential log appends, and the
+    256 MiB page cache plus mmap keep the b-trees being rewritten in memory. The
+    exclusive lock is fine for single-writer scripts; set before WAL is first entered,
+    it also keeps the WAL index in heap memory, so no shm file is created. Close with
+    :func:`finish`, which takes the file back out of WAL.
+    """
+    con.executescript(
+        """
+        PRAGMA locking_mode=EXCLUSIVE;
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA mmap_size=268435456;
+        PRAGMA cache_size=-262144;
+        PRAGMA temp_store=MEMORY;
+        """
+    )
+    return con
+
+
+def finish(con: sqlite3.Connection) -> None:
+    """Switch a :func:`tune`-d connection back to journal_mode=DELETE and close it.
+
+    WAL is a persistent property of the file, and these databases ship to read-only
+    deployments, where a WAL database can't be opened without its -wal/-shm files. The
+    switch checkpoints the log into the main file and removes it. An open transaction is
+    left to close() to roll back.
+    """
+    try:
+        if not con.in_transaction:
+            con.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        con.close()
+
+
+def ensure_columns(con: sqlite3.Connection, table: str, cols: Iterable[Tuple[str, str]]) -> List[str]:
+    """Add any of ``cols`` ((name, type) pairs) missing from ``table``; return the added names.
+
+    All ALTERs run in one transaction, so several missing columns cost a single
+    schema-version bump (and one invalidation of other connections' statements).
+    """
+    have = {row[1] for row in con.execute(f"PRAGMA table_info({table})")}
+    missing = [(name, typ) for name, typ in cols if name not in have]
+    if missing:
+        own_txn = not con.in_transaction
+        if own_txn:
+            con.execute("BEGIN")
+        for name, typ in missing:
+            con.execute(f"ALTER TABLE {table} ADD COLUMN {name} {typ}")
+        if own_txn:
+            con.commit()
+    return [name for name, _ in missing]
+
+
+__all__ = ["ensure_columns", "finish", "tune"]
@@ -1,8 +1,8 @@
 """Deterministic fallback results used when the SQLite index is unavailable."""
 from __future__ import annotations
 
-import re
 import unicodedata
+from functools import lru_cache
 
 from typing import Dict, Iterable, List, Sequence, Tuple
 
@@ -31,12 +31,16 @@ def _entry(word: str,
         "syllables": int(syllables),
     }
 
-_CLEAN_RE = re.compile(r"[^a-z0-9']+")
+# every ASCII char outside [a-z0-9'] (applied after lower(), so A-Z never reach it)
+_CLEAN_DROP = str.maketrans("", "", "".join(
+    chr(c) for c in range(128) if not (chr(c).islower() or chr(c).isdigit() or chr(c) == "'")))
 
 def _clean_key(text: str) -> str:
-    normalized = unicodedata.normalize("NFKD", text or "")
-    ascii_text = normalized.encode("ascii", "ignore").decode("ascii")
-    return _CLEAN_RE.sub("", ascii_text.lower())
+    text = text or ""
+    if not text.isascii():
+        # fold accents (é -> e) and drop whatever has no ASCII form
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return text.lower().translate(_CLEAN_DROP)
 
 # Define raw fallback templates: mapping query key -> sequence of (word, type, syllables).
 _RAW_RESULTS: Dict[str, Sequence[Tuple[str, str, int]]] = {
@@ -438,6 +442,7 @@ for word, pron in _RAW_PRONS:
     FALLBACK_PRONS[_clean_key(word)] = pron
 
 
+@lru_cache(maxsize=16384)
 def fallback_key(word: str) -> str:
     """Return the canonical lookup key used for fallback dictionaries."""
     return _clean_key(word)
@@ -6,8 +6,21 @@ from .phonetics import (
     key_k1,
     key_k2,
     tail_keys,
+    encode_phones,
 )
 
+# optional: precompute rarity so search doesn't call wordfreq per candidate
+try:
+    from wordfreq import zipf_frequency
+except Exception:  # pragma: no cover
+    zipf_frequency = None
+
+def _zipf_x100(word: str) -> int | None:
+    # zipf_frequency rounds to hundredths, so an integer column is lossless
+    if zipf_frequency is None:
+        return None
+    return int(round(zipf_frequency(word, "en") * 100))
+
 def build_words_index(cmu_path: str, sqlite_path: str):
     os.makedirs(os.path.dirname(sqlite_path), exist_ok=True)
     con = sqlite3.connect(sqlite_path)
@@ -22,9 +35,13 @@ def build_words_index(cmu_path: str, sqlite_path: str):
             k2   TEXT NOT NULL,
             rime_key  TEXT NOT NULL,
             vowel_key TEXT NOT NULL,
-            coda_key  TEXT NOT NULL
-        );
-        CREATE INDEX IF NOT EXISTS idx_k1 ON words(k1);
+            coda_key  TEXT NOT NULL,
+            pron_bytes BLOB,
+            zipf_x100 INTEGER
+        ) WITHOUT ROWID;
+        -- covers _words_by_keys (k1=? AND k2=? AND syls BETWEEN ...) without touching the table b-tree;
+        -- word comes right after the keys so LIMITed pulls stay in alphabetical order
+        CREATE INDEX IF NOT EXISTS idx_k1_k2 ON words(k1, k2, word, syls, pron, zipf_x100);
         CREATE INDEX IF NOT EXISTS idx_k2 ON words(k2);
         CREATE INDEX IF NOT EXISTS idx_rime_key ON words(rime_key);
         CREATE INDEX IF NOT EXISTS idx_vowel_key ON words(vowel_key);
@@ -38,19 +55,22 @@ def build_words_index(cmu_path: str, sqlite_path: str):
                 continue
             word, phones = parsed
             syls = syllable_count(phones)
-            k1 = json.dumps(tuple(key_k1(phones)))
-            k2 = json.dumps(tuple(key_k2(phones)))
+            # keys are only ever compared for equality: store them in the same
+            # space-joined form search derives at query time, not as JSON
+            k1 = " ".join(key_k1(phones))
+            k2 = " ".join(key_k2(phones))
             vowel, coda, rime = tail_keys(phones)
-            batch.append((word, json.dumps(phones), syls, k1, k2, rime, vowel, coda))
+            batch.append((word, json.dumps(phones), syls, k1, k2, rime, vowel, coda,
+                          encode_phones(phones), _zipf_x100(word)))
             if len(batch) >= 2000:
                 cur.executemany(
-                    "INSERT OR REPLACE INTO words VALUES(?,?,?,?,?,?,?,?)",
+                    "INSERT OR REPLACE INTO words VALUES(?,?,?,?,?,?,?,?,?,?)",
                     batch,
                 )
                 batch.clear()
     if batch:
         cur.executemany(
-            "INSERT OR REPLACE INTO words VALUES(?,?,?,?,?,?,?,?)",
+            "INSERT OR REPLACE INTO words VALUES(?,?,?,?,?,?,?,?,?,?)",
             batch,
         )
     con.commit(); con.close()
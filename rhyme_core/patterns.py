@@ -24,11 +24,13 @@ from __future__ import annotations
 from pathlib import Path
 import re
 import sqlite3
+import threading
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 # Reuse internals from search core
 from .search import classify_rhyme, phrase_to_pron, syllable_count  # type: ignore
-from .search import _get_pron  # type: ignore  # internal but stable
+from .search import _classify_keys, _clean_word, _open_cached, _get_pron, _pron_rhyme_keys, _prons_for  # type: ignore  # internal but stable
 
 DATA_DIR = Path("data")
 DEFAULT_DB = DATA_DIR / "patterns_small.db"
@@ -51,16 +53,27 @@ _WORD_RE = re.compile(r"[A-Za-z][A-Za-z']+")
 # SQLite helpers
 # -----------------------------------------------------------------------------
 
-def _open_patterns(db_path: Optional[Path] = None) -> sqlite3.Connection:
-    p = Path(db_path) if db_path else DEFAULT_DB
-    con = sqlite3.connect(str(p))
-    con.row_factory = sqlite3.Row
+_local = threading.local()
+
+def _cached_con(path: Path, by_name: bool = False) -> sqlite3.Connection:
+    # one connection per (thread, DB): its statement cache then actually gets reused
+    cache = getattr(_local, "cons", None)
+    if cache is None:
+        cache = _local.cons = {}
+    key = (str(path), by_name)
+    con = cache.get(key)
+    if con is None:
+        con = cache[key] = _open_cached(path)
+        if by_name:
+            # patterns dumps vary in schema, so those rows are read by column alias
+            con.row_factory = sqlite3.Row
     return con
 
+def _open_patterns(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    return _cached_con(Path(db_path) if db_path else DEFAULT_DB, by_name=True)
+
 def _open_words() -> sqlite3.Connection:
-    con = sqlite3.connect(str(WORDS_DB))
-    con.row_factory = sqlite3.Row
-    return con
+    return _cached_con(WORDS_DB)
 
 def _table_name(con: sqlite3.Connection) -> str:
     # Prefer "patterns" if present
@@ -84,29 +97,73 @@ def _first_present(cols: Dict[str, int], candidates: List[str], default: Optiona
             return c
     return default
 
+@lru_cache(maxsize=16)
+def _layout(db: str) -> Dict[str, object]:
+    """Table/column mapping of a patterns DB, probed once per path."""
+    con = _open_patterns(Path(db))
+    table = _table_name(con)
+    cols = _columns(con, table)
+    if all(k in cols for k in KEY_COLS):
+        # the key lookup ORs the three columns; each needs its own index
+        try:
+            for k in KEY_COLS:
+                con.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{k} ON {table}({k})")
+        except sqlite3.DatabaseError:
+            pass  # read-only or locked DB: fall back to whatever indexes exist
+    return {
+        "table": table,
+        "src": _first_present(cols, SRC_CANDIDATES, "source_word") or "source_word",
+        "tgt": _first_present(cols, TGT_CANDIDATES, "target_word") or "target_word",
+        "lyr": _first_present(cols, LYR_CANDIDATES, "lyric") or "lyric",
+        "artist": _first_present(cols, ARTIST_CANDIDATES, None),
+        "song": _first_present(cols, SONG_CANDIDATES, None),
+        "url": _first_present(cols, URL_CANDIDATES, None),
+        "ctx": "lyric_context" if "lyric_context" in cols else None,
+        "has_keys": all(k in cols for k in KEY_COLS),
+    }
+
+@lru_cache(maxsize=128)
+def _select_sql(db: str, key_cols: Tuple[str, ...], n_like: int) -> str:
+    # bounded set of shapes (key subset or LIKE count) => identical text per shape,
+    # so the connection's statement cache skips re-preparing it
+    lay = _layout(db)
+    fields = [f"{lay['src']} AS src", f"{lay['tgt']} AS tgt", f"{lay['lyr']} AS lyric"]
+    if lay["artist"]: fields.append(f"{lay['artist']} AS artist")
+    if lay["song"]: fields.append(f"{lay['song']} AS song")
+    if lay["url"]: fields.append(f"{lay['url']} AS url")
+    if lay["ctx"]: fields.append("lyric_context AS lyric_context")
+    sql = f"SELECT {', '.join(fields)} FROM {lay['table']}"
+    if key_cols:
+        sql += " WHERE " + " OR ".join(f"{k}=?" for k in key_cols)
+    elif n_like:
+        sql += " WHERE (" + " OR ".join([f"{lay['lyr']} LIKE ?"] * n_like) + ")"
+    return sql + " LIMIT ?"
+
 # -----------------------------------------------------------------------------
 # Context + highlighting
 # -----------------------------------------------------------------------------
 
+@lru_cache(maxsize=4096)
+def _tokens_re(tokens: Tuple[str, ...]) -> "re.Pattern[str]":
+    # one compiled alternation per token set (longest first, as the old per-token
+    # passes did) instead of an re.sub/re.search per token per row
+    alts = sorted({t.lower() for t in tokens}, key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, alts)) + r")\b", re.IGNORECASE)
+
 def _highlight(snippet: str, tokens: List[str]) -> str:
-    if not snippet:
+    toks = tuple(t for t in tokens if t)
+    if not snippet or not toks:
         return snippet
-    out = snippet
-    for t in sorted(set(t for t in tokens if t), key=len, reverse=True):
-        out = re.sub(rf"\b{re.escape(t)}\b", lambda m: f"[{m.group(0)}]", out, flags=re.IGNORECASE)
-    return out
+    return _tokens_re(toks).sub(r"[\g<0>]", snippet)
 
 def _context_from_lyric(lyric: str, src: str, tgt: str, radius: int = 90) -> str:
     text = (lyric or "").strip()
     if not text:
         return ""
     tokens = [w for w in [src, tgt] if w]
-    # find earliest of src/tgt
-    pos = None
-    for t in tokens:
-        m = re.search(rf"\b{re.escape(t)}\b", text, flags=re.IGNORECASE)
-        if m:
-            pos = m.start() if pos is None else min(pos, m.start())
+    # find earliest of src/tgt (leftmost match of the alternation)
+    m = _tokens_re(tuple(tokens)).search(text) if tokens else None
+    pos = m.start() if m else None
     if pos is None:
         # Just center on the middle to avoid empty
         mid = max(0, len(text) // 2)
@@ -124,14 +181,10 @@ def _keys_for_last_token(query: str) -> Tuple[str, str, str]:
     if not tokens:
         return "", "", ""
     last = tokens[-1]
-    con = _open_words()
-    try:
-        r = con.execute("SELECT rime_key, vowel_key, coda_key FROM words WHERE word=?", (last,)).fetchone()
-        if not r:
-            return "", "", ""
-        return r["rime_key"] or "", r["vowel_key"] or "", r["coda_key"] or ""
-    finally:
-        con.close()
+    r = _open_words().execute("SELECT rime_key, vowel_key, coda_key FROM words WHERE word=?", (last,)).fetchone()
+    if not r:
+        return "", "", ""
+    return r[0] or "", r[1] or "", r[2] or ""
 
 # -----------------------------------------------------------------------------
 # Main API
@@ -152,128 +205,108 @@ def find_patterns_by_keys(query: str,
 
     We always post-filter by rhyme validity using the same classifier as the main search.
     """
-    con = _open_patterns(db_path)
-    try:
-        table = _table_name(con)
-        cols = _columns(con, table)
-
-        src_col = _first_present(cols, SRC_CANDIDATES, "source_word") or "source_word"
-        tgt_col = _first_present(cols, TGT_CANDIDATES, "target_word") or "target_word"
-        lyr_col = _first_present(cols, LYR_CANDIDATES, "lyric") or "lyric"
-        art_col = _first_present(cols, ARTIST_CANDIDATES, None)
-        song_col = _first_present(cols, SONG_CANDIDATES, None)
-        url_col  = _first_present(cols, URL_CANDIDATES, None)
-        ctx_col = "lyric_context" if "lyric_context" in cols else None
-
-        qv, qvv, qc = _keys_for_last_token(query)
-        has_keys = all(k in cols for k in KEY_COLS)
-
-        # Build SQL
-        fields = [f"{src_col} AS src", f"{tgt_col} AS tgt", f"{lyr_col} AS lyric"]
-        if art_col: fields.append(f"{art_col} AS artist")
-        if song_col: fields.append(f"{song_col} AS song")
-        if url_col: fields.append(f"{url_col} AS url")
-        if ctx_col: fields.append("lyric_context AS lyric_context")
-        sql = f"SELECT {', '.join(fields)} FROM {table}"
-        args: List[object] = []
-
-        if has_keys and (qv or qvv or qc):
-            conds = []
-            if qv:  conds.append("rime_key=?");   args.append(qv)
-            if qvv: conds.append("vowel_key=?");  args.append(qvv)
-            if qc:  conds.append("coda_key=?");   args.append(qc)
-            if conds:
-                sql += " WHERE " + " OR ".join(conds)
+    db = str(Path(db_path) if db_path else DEFAULT_DB)
+    con = _open_patterns(Path(db))
+    lay = _layout(db)
+    art_col, song_col, url_col, ctx_col = lay["artist"], lay["song"], lay["url"], lay["ctx"]
+
+    qv, qvv, qc = _keys_for_last_token(query)
+    args: List[object] = []
+    key_cols: Tuple[str, ...] = ()
+    n_like = 0
+
+    if lay["has_keys"] and (qv or qvv or qc):
+        key_cols = tuple(k for k, v in zip(KEY_COLS, (qv, qvv, qc)) if v)
+        args.extend(v for v in (qv, qvv, qc) if v)
+    else:
+        # fallback LIKE; match lyric contains any query token
+        qtokens = [m.group(0) for m in _WORD_RE.finditer(query)]
+        n_like = len(qtokens)
+        args.extend([f"%{t}%" for t in qtokens])
+
+    # pull a widened pool to allow post filtering
+    sql = _select_sql(db, key_cols, n_like)
+    args.append(max(300, limit * 12))
+
+    rows = con.execute(sql, args).fetchall()
+
+    # Prepare query pronunciation and its rhyme keys once
+    qpron = _get_pron(query) or phrase_to_pron(query)
+    qkeys = _pron_rhyme_keys(tuple(qpron)) if qpron else None
+
+    # resolve every source/target pron in one round-trip
+    prons = _prons_for([w for r in rows for w in (r["src"] or "", r["tgt"] or "")])
+
+    out: List[Dict[str, object]] = []
+    for r in rows:
+        src = (r["src"] or "").strip()
+        tgt = (r["tgt"] or "").strip()
+        lyric = (r["lyric"] or "").strip()
+
+        spron = prons.get(_clean_word(src)) or []
+        tpron = prons.get(_clean_word(tgt)) or []
+
+        r_src = _classify_keys(qkeys, spron) if qkeys else "none"
+        r_tgt = _classify_keys(qkeys, tpron) if qkeys else "none"
+
+        # Decide acceptance: either side must rhyme; consonants are optional
+        ok_src = r_src in ("perfect", "assonant", "slant") or (include_consonant and r_src == "consonant")
+        ok_tgt = r_tgt in ("perfect", "assonant", "slant") or (include_consonant and r_tgt == "consonant")
+        if not (ok_src or ok_tgt):
+            continue
+
+        # Optional syllable bounds (only filter the side that rhymes)
+        if ok_src:
+            ss = syllable_count(spron)
+            if ss and (ss < syllable_min or ss > syllable_max):
+                ok_src = False
+        if ok_tgt:
+            ts = syllable_count(tpron)
+            if ts and (ts < syllable_min or ts > syllable_max):
+                ok_tgt = False
+        if not (ok_src or ok_tgt):
+            continue
+
+        # Build context
+        context = r["lyric_context"].strip() if (ctx_col and r["lyric_context"]) else _context_from_lyric(lyric, src, tgt)
+
+        item: Dict[str, object] = {
+            "source": src,
+            "target": tgt,
+            "context": context,
+        }
+        if art_col: item["artist"] = r["artist"]
+        if song_col: item["song"] = r["song"]
+        if url_col:  item["url"] = r["url"]
+
+        # Primary type for display preference
+        if ok_src and r_src != "none":
+            item["type"] = r_src
+        elif ok_tgt:
+            item["type"] = r_tgt
         else:
-            # fallback LIKE; match lyric contains any query token
-            qtokens = [m.group(0) for m in _WORD_RE.finditer(query)]
-            if qtokens:
-                like_cond = "(" + " OR ".join([f"{lyr_col} LIKE ?"] * len(qtokens)) + ")"
-                sql += f" WHERE {like_cond}"
-                args.extend([f"%{t}%" for t in qtokens])
-
-        # pull a widened pool to allow post filtering
-        sql += " LIMIT ?"
-        args.append(max(300, limit * 12))
-
-        rows = con.execute(sql, args).fetchall()
-
-        # Prepare query pronunciation once
-        qpron = _get_pron(query) or phrase_to_pron(query)
-
-        out: List[Dict[str, object]] = []
-        for r in rows:
-            src = (r["src"] or "").strip()
-            tgt = (r["tgt"] or "").strip()
-            lyric = (r["lyric"] or "").strip()
-
-            spron = _get_pron(src) or []
-            tpron = _get_pron(tgt) or []
-
-            r_src = classify_rhyme(qpron, spron)
-            r_tgt = classify_rhyme(qpron, tpron)
-
-            # Decide acceptance: either side must rhyme; consonants are optional
-            ok_src = r_src in ("perfect", "assonant", "slant") or (include_consonant and r_src == "consonant")
-            ok_tgt = r_tgt in ("perfect", "assonant", "slant") or (include_consonant and r_tgt == "consonant")
-            if not (ok_src or ok_tgt):
-                continue
-
-            # Optional syllable bounds (only filter the side that rhymes)
-            if ok_src:
-                ss = syllable_count(spron)
-                if ss and (ss < syllable_min or ss > syllable_max):
-                    ok_src = False
-            if ok_tgt:
-                ts = syllable_count(tpron)
-                if ts and (ts < syllable_min or ts > syllable_max):
-                    ok_tgt = False
-            if not (ok_src or ok_tgt):
-                continue
-
-            # Build context
-            context = r["lyric_context"].strip() if (ctx_col and r["lyric_context"]) else _context_from_lyric(lyric, src, tgt)
-
-            item: Dict[str, object] = {
-                "source": src,
-                "target": tgt,
-                "context": context,
-            }
-            if art_col: item["artist"] = r["artist"]
-            if song_col: item["song"] = r["song"]
-            if url_col:  item["url"] = r["url"]
-
-            # Primary type for display preference
-            if ok_src and r_src != "none":
-                item["type"] = r_src
-            elif ok_tgt:
-                item["type"] = r_tgt
-            else:
-                item["type"] = "slant"
-
-            out.append(item)
-
-        # De-dup: (source, target, song) triple
-        seen = set()
-        uniq: List[Dict[str, object]] = []
-        for it in out:
-            key = (it.get("source",""), it.get("target",""), it.get("song",""))
-            if key in seen:
-                continue
-            seen.add(key)
-            uniq.append(it)
-
-        # Sort: prefer perfect/assonant, then title/artist alpha for determinism
-        order = {"perfect": 0, "assonant": 1, "slant": 2, "consonant": 3}
-        uniq.sort(key=lambda x: (order.get(str(x.get("type","slant")), 9),
-                                 str(x.get("song","")).lower(),
-                                 str(x.get("artist","")).lower(),
-                                 str(x.get("source","")).lower(),
-                                 str(x.get("target","")).lower()))
-        return uniq[:limit]
-
-    finally:
-        con.close()
+            item["type"] = "slant"
+
+        out.append(item)
+
+    # De-dup: (source, target, song) triple
+    seen = set()
+    uniq: List[Dict[str, object]] = []
+    for it in out:
+        key = (it.get("source",""), it.get("target",""), it.get("song",""))
+        if key in seen:
+            continue
+        seen.add(key)
+        uniq.append(it)
+
+    # Sort: prefer perfect/assonant, then title/artist alpha for determinism
+    order = {"perfect": 0, "assonant": 1, "slant": 2, "consonant": 3}
+    uniq.sort(key=lambda x: (order.get(str(x.get("type","slant")), 9),
+                             str(x.get("song","")).lower(),
+                             str(x.get("artist","")).lower(),
+                             str(x.get("source","")).lower(),
+                             str(x.get("target","")).lower()))
+    return uniq[:limit]
 
 def find_patterns_by_keys_enriched(query: str,
                                    limit: int = 20,
@@ -4,9 +4,16 @@ from typing import Iterable, List, Sequence, Tuple
 import json
 import re
 
+try:
+    import orjson  # optional: several times faster than json for pron arrays
+    _json_loads = orjson.loads
+except Exception:
+    _json_loads = json.loads
+
 VOWEL_RE = re.compile(r"[AEIOU]")        # ARPABET vowel marker in stress symbols
 STRESS_RE = re.compile(r"\d")           # captures 0/1/2
 SYLLABLE_VOWELS = {"AA","AE","AH","AO","AW","AY","EH","ER","EY","IH","IY","OW","OY","UH","UW"}
+_VOWEL2 = frozenset(SYLLABLE_VOWELS)  # every ARPABET vowel is exactly two letters
 
 def parse_cmu_line(line: str) -> tuple[str, List[str]] | None:
     line=line.strip()
@@ -62,7 +69,7 @@ def parse_pron_field(pron: str | Sequence[str] | Iterable[str] | None) -> List[s
 
     if p.startswith("[") and p.endswith("]"):
         try:
-            arr = json.loads(p)
+            arr = _json_loads(p)
         except Exception:
             arr = None
         if isinstance(arr, (list, tuple)):
@@ -80,8 +87,9 @@ def tail_keys(phones: Sequence[str]) -> Tuple[str, str, str]:
 
     v_idx = -1
     for i in range(len(toks) - 1, -1, -1):
-        base = toks[i].rstrip("0123456789")
-        if base in SYLLABLE_VOWELS:
+        tok = toks[i]
+        # two-letter prefix + optional stress digits: no rstrip'd copy per token
+        if tok[:2] in _VOWEL2 and (len(tok) == 2 or tok[2:].isdigit()):
             v_idx = i
             break
 
@@ -94,3 +102,36 @@ def tail_keys(phones: Sequence[str]) -> Tuple[str, str, str]:
     coda = "".join(after) if after else ""
     rime = f"{vowel}-{coda}" if coda else vowel
     return vowel, coda, rime
+
+
+# Fixed ARPABET inventory (39 phones). A phone packs into one byte as
+# (phone_id << 2) | stress, so a pronunciation round-trips through a BLOB
+# without a JSON parser on the read path.
+PHONES: Tuple[str, ...] = (
+    "AA","AE","AH","AO","AW","AY","B","CH","D","DH","EH","ER","EY","F","G","HH",
+    "IH","IY","JH","K","L","M","N","NG","OW","OY","P","R","S","SH","T","TH",
+    "UH","UW","V","W","Y","Z","ZH",
+)
+_PHONE_ID = {p: i for i, p in enumerate(PHONES)}
+_ID_PHONE: Tuple[str, ...] = tuple(
+    (f"{PHONES[b >> 2]}{b & 3}" if PHONES[b >> 2] in SYLLABLE_VOWELS else PHONES[b >> 2])
+    if (b >> 2) < len(PHONES) else ""
+    for b in range(256)
+)
+
+
+def encode_phones(phones: Sequence[str]) -> bytes | None:
+    """Pack ARPABET tokens into bytes; None if a token is outside the inventory."""
+    out = bytearray()
+    for tok in phones:
+        base = tok.rstrip("012")
+        pid = _PHONE_ID.get(base)
+        if pid is None or len(tok) - len(base) > 1:
+            return None
+        out.append((pid << 2) | (int(tok[-1]) if tok != base else 0))
+    return bytes(out)
+
+
+def decode_phones(blob: bytes) -> List[str]:
+    """Inverse of :func:`encode_phones`."""
+    return [_ID_PHONE[b] for b in blob]
@@ -2,19 +2,21 @@ from __future__ import annotations
 import re
 from typing import List
 
+from .phonetics import SYLLABLE_VOWELS
+
 STRESS_RE = re.compile(r"(\d)")
 VOWEL_RE = re.compile(r"^(AA|AE|AH|AO|AW|AY|EH|ER|EY|IH|IY|OW|OY|UH|UW)\d?$")
 
+def _is_syllabic(p: str) -> bool:
+    # same test as VOWEL_RE without the regex engine: vowel base + optional digit
+    return (p[:-1] if p[-1:].isdecimal() else p) in SYLLABLE_VOWELS
+
 def syllable_count(pron: List[str]) -> int:
-    return sum(1 for p in pron if VOWEL_RE.match(p))
+    return sum(1 for p in pron if _is_syllabic(p))
 
 def stress_digits(pron: List[str]) -> List[int]:
-    digs = []
-    for p in pron:
-        m = STRESS_RE.search(p)
-        if m:
-            digs.append(int(m.group(1)))
-    return digs
+    # ARPABET stress is the trailing digit of a vowel token
+    return [int(p[-1]) for p in pron if p[-1:].isdecimal()]
 
 def stress_pattern_str(pron: List[str]) -> str:
     digs = stress_digits(pron)
@@ -1,20 +1,16 @@
 from __future__ import annotations
-import re
 from typing import Tuple
 
-VOWELS = {
-    "AA","AE","AH","AO","AW","AY","EH","ER","EY","IH","IY","OW","OY","UH","UW"
-}
+from .phonetics import SYLLABLE_VOWELS as VOWELS
 
 def is_vowel(phone: str) -> bool:
-    base = re.sub(r"\d", "", phone)
-    return base in VOWELS
+    return phone.rstrip("012") in VOWELS
 
 def only_vowels(phones: Tuple[str,...]) -> Tuple[str,...]:
-    return tuple(re.sub(r"\d", "", p) for p in phones if is_vowel(p))
+    return tuple(p.rstrip("012") for p in phones if is_vowel(p))
 
 def only_cons(phones: Tuple[str,...]) -> Tuple[str,...]:
-    return tuple(re.sub(r"\d", "", p) for p in phones if not is_vowel(p))
+    return tuple(p.rstrip("012") for p in phones if not is_vowel(p))
 
 def syllables(phones: Tuple[str,...]) -> int:
     return sum(1 for p in phones if is_vowel(p))
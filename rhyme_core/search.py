@@ -1,15 +1,22 @@
 
 import os
+import heapq
 import json
 import sqlite3
+import threading
+import weakref
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .phonetics import PHONES, SYLLABLE_VOWELS as VOWELS, decode_phones, encode_phones
 
 # ===== tuning knobs =====
 _UNCOMMON_ZIPF_MAX = float(os.getenv("UR_UNCOMMON_ZIPF_MAX", "4.3"))  # increase => more items count as "uncommon"
 _MULTIWORD_CAP     = int(os.getenv("UR_MULTIWORD_CAP", "100"))        # widen phrase candidate pool for multiword
 _USE_LLM           = os.getenv("USE_LLM", "0") == "1"                  # keep off in Codespaces/CI
+_WORDS_IN_MEMORY   = os.getenv("UR_WORDS_IN_MEMORY", "0") == "1"       # serve k1/k2 lookups from RAM (~100 MB)
 
 # rarity via wordfreq (safe fallback if not installed)
 try:
@@ -27,103 +34,165 @@ RAP_DB       = Path(os.environ.get("UR_RAP_DB", os.path.join("data", "rap_lines.
 def normalize_text(s: str) -> str:
     return (s or "").strip().lower()
 
+# ASCII chars _clean_word drops; str.translate does the filtering in C
+_ASCII_DROP = str.maketrans("", "", "".join(
+    chr(c) for c in range(128) if not (chr(c).isalpha() or chr(c) in "'-")))
+
 def _clean_word(w: str) -> str:
-    return "".join(ch for ch in (w or "") if ch.isalpha() or ch in ("'", "-")).lower()
+    w = w or ""
+    if w.isascii():
+        return w.translate(_ASCII_DROP).lower()
+    return "".join(ch for ch in w if ch.isalpha() or ch in ("'", "-")).lower()
 
-def _connect():
-    con = sqlite3.connect(str(WORDS_DB))
-    con.row_factory = sqlite3.Row
-    return con
+_local = threading.local()
 
-def _connect_opt(path: Path) -> Optional[sqlite3.Connection]:
+class _ThreadOwner:
+    """Weakref-able per-thread token: its finalizer closes that thread's connections."""
+    __slots__ = ("__weakref__",)
+
+def _close_all(cons: List[sqlite3.Connection]) -> None:
+    for con in cons:
+        try:
+            con.close()
+        except sqlite3.Error:
+            pass
+    cons.clear()
+
+def _thread_cons() -> List[sqlite3.Connection]:
+    cons = getattr(_local, "owned", None)
+    if cons is None:
+        cons = _local.owned = []
+        _local.owner = _ThreadOwner()
+        # fires when the thread dies and its locals are freed (short-lived Gradio/anyio
+        # workers), or at interpreter exit for threads still alive then
+        weakref.finalize(_local.owner, _close_all, cons)
+    return cons
+
+def _open_cached(path: Path) -> sqlite3.Connection:
+    # check_same_thread=False only so the finalizer may close it from whichever thread
+    # runs it; each connection is still used solely by the thread that opened it
+    # default tuple rows: every hot read is positional, and tuples can be cached as-is
+    # mode=rw: a missing (optional) DB raises instead of leaving an empty file behind
+    con = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=rw", uri=True,
+                          check_same_thread=False, cached_statements=256)
     try:
-        if path.exists():
-            con = sqlite3.connect(str(path))
-            con.row_factory = sqlite3.Row
-            return con
+        # per-connection read knobs only; the journal mode is left as shipped (DELETE):
+        # readers just take shared locks, and nothing writes while the app serves
+        con.execute("PRAGMA mmap_size=268435456")
+        con.execute("PRAGMA cache_size=-65536")
+        con.execute("PRAGMA temp_store=MEMORY")
     except sqlite3.DatabaseError:
-        return None
-    return None
+        pass
+    _thread_cons().append(con)
+    return con
+
+def _connect() -> sqlite3.Connection:
+    """Per-thread connection to WORDS_DB, opened once and reused (read-only workload)."""
+    con = getattr(_local, "con", None)
+    if con is None:
+        con = _local.con = _open_cached(WORDS_DB)
+    return con
+
+def _connect_opt(path: Path) -> Optional[sqlite3.Connection]:
+    """Per-thread cached connection to an optional DB; None if it is missing."""
+    cache = getattr(_local, "opt", None)
+    if cache is None:
+        cache = _local.opt = {}
+    key = str(path)
+    con = cache.get(key)
+    if con is None:
+        try:
+            if not path.exists():
+                return None
+            con = cache[key] = _open_cached(path)
+        except sqlite3.DatabaseError:
+            return None
+    return con
 
-VOWELS = {"AA","AE","AH","AO","AW","AY","EH","ER","EY","IH","IY","OW","OY","UH","UW"}
 def _is_vowel(tok: str) -> bool:
-    base = "".join(ch for ch in tok if ch.isalpha())
-    return base in VOWELS
+    return tok.rstrip("012") in VOWELS
 
 def _strip_stress(tok: str) -> str:
     return tok[:-1] if tok and tok[-1] in "012" else tok
 
-@lru_cache(maxsize=65536)
-def _db_row_for_word(word: str) -> Optional[sqlite3.Row]:
+@lru_cache(maxsize=1)
+def _words_columns() -> frozenset:
+    """Column names of the words table (empty if the DB is unreadable)."""
+    try:
+        return frozenset(r[1] for r in _connect().execute("PRAGMA table_info(words)"))
+    except sqlite3.DatabaseError:
+        return frozenset()
+
+class WordRow(NamedTuple):
+    """One words-table row (legacy 5-column DBs get synthesized tail keys)."""
+    word: str
+    pron: Any
+    syls: int
+    k1: str
+    k2: str
+    rime_key: str
+    vowel_key: str
+    coda_key: str
+    pron_bytes: Optional[bytes] = None
+
+def _db_row_for_word(word: str) -> Optional[WordRow]:
     """Fetch a row from words DB; supports both 8-col (new) and 5-col (legacy) schemas by synthesizing keys."""
     w = _clean_word(word)
-    if not w:
-        return None
+    return _db_row_for_clean_word(w) if w else None
+
+@lru_cache(maxsize=65536)
+def _db_row_for_clean_word(w: str) -> Optional[WordRow]:
+    # keyed on the cleaned form so "Hat", "hat!" and "hat" share one entry
     con = _connect()
     try:
         # try new schema
+        extra = ",pron_bytes" if "pron_bytes" in _words_columns() else ""
         row = con.execute(
-            "SELECT word,pron,syls,k1,k2,rime_key,vowel_key,coda_key FROM words WHERE word=?",
+            f"SELECT word,pron,syls,k1,k2,rime_key,vowel_key,coda_key{extra} FROM words WHERE word=?",
             (w,),
         ).fetchone()
         if row:
-            return row
+            return WordRow(*row)
     except sqlite3.OperationalError:
         # fall through to legacy schema
         pass
-    try:
-        row = con.execute("SELECT word,pron,syls,k1,k2 FROM words WHERE word=?", (w,)).fetchone()
-        if not row:
-            return None
-        d = dict(row)
-        pron = (d.get("pron") or "").split()
-        # rime_key (stress nucleus + coda)
-        if d.get("k1"):
-            rime_key = d["k1"]
-        else:
-            stressed = last = -1
-            for i,t in enumerate(pron):
-                if _is_vowel(t):
-                    last = i
-                    if t[-1:] in ("1","2"): stressed = i
-            if stressed == -1: stressed = last
-            rime_key = " ".join(pron[stressed:]) if stressed != -1 else ""
-        # vowel_key + coda_key from k2 or derive
-        if d.get("k2"):
-            parts = d["k2"].split()
-            vowel_key = _strip_stress(parts[0]) if parts else ""
-            coda_key  = " ".join(parts[1:]) if len(parts) > 1 else ""
+    row = con.execute("SELECT word,pron,syls,k1,k2 FROM words WHERE word=?", (w,)).fetchone()
+    if not row:
+        return None
+    word, pron_txt, syls, k1, k2 = row
+    pron = (pron_txt or "").split()
+    # rime_key (stress nucleus + coda)
+    if k1:
+        rime_key = k1
+    else:
+        stressed = last = -1
+        for i,t in enumerate(pron):
+            if _is_vowel(t):
+                last = i
+                if t[-1:] in ("1","2"): stressed = i
+        if stressed == -1: stressed = last
+        rime_key = " ".join(pron[stressed:]) if stressed != -1 else ""
+    # vowel_key + coda_key from k2 or derive
+    if k2:
+        parts = k2.split()
+        vowel_key = _strip_stress(parts[0]) if parts else ""
+        coda_key  = " ".join(parts[1:]) if len(parts) > 1 else ""
+    else:
+        last = -1
+        for i,t in enumerate(pron):
+            if _is_vowel(t): last = i
+        if last == -1:
+            vowel_key = coda_key = ""
         else:
-            last = -1
-            for i,t in enumerate(pron):
-                if _is_vowel(t): last = i
-            if last == -1:
-                vowel_key = coda_key = ""
-            else:
-                vowel_key = _strip_stress(pron[last])
-                coda_key  = " ".join(pron[last+1:])
-        d["rime_key"]  = rime_key
-        d["vowel_key"] = vowel_key
-        d["coda_key"]  = coda_key
-        class RowLike(dict):
-            def __getattr__(self, k): return self[k]
-            def get(self, k, default=None): return super().get(k, default)
-            def keys(self): return super().keys()
-        return RowLike(d)
-    finally:
-        con.close()
+            vowel_key = _strip_stress(pron[last])
+            coda_key  = " ".join(pron[last+1:])
+    return WordRow(word, pron_txt, syls, k1, k2, rime_key, vowel_key, coda_key)
 
 # ----- pronunciation helpers -----
-@lru_cache(maxsize=100_000)
-def _get_pron(word: str) -> Optional[List[str]]:
-    """Return ARPAbet phones for a single word, or None."""
-    key = _clean_word(word)
-    if not key:
-        return None
-    row = _db_row_for_word(key)
-    if row is None:
-        return None
-    v = row["pron"]
+def _row_pron(v: Any, packed: Optional[bytes] = None) -> List[str]:
+    """Decode a words row's pron column; prefers the packed pron_bytes value."""
+    if packed:
+        return decode_phones(packed)
     if isinstance(v, (bytes, bytearray)):
         # attempt JSON, else decode to string
         try:
@@ -137,11 +206,40 @@ def _get_pron(word: str) -> Optional[List[str]]:
                 return json.loads(s) or []
             except Exception:
                 pass
-        toks = [p for p in s.split() if p]
-        return toks or None
+        return [p for p in s.split() if p]
     if isinstance(v, list):
         return v
-    return None
+    return []
+
+@lru_cache(maxsize=100_000)
+def _get_pron(word: str) -> Optional[List[str]]:
+    """Return ARPAbet phones for a single word, or None."""
+    key = _clean_word(word)
+    if not key:
+        return None
+    row = _db_row_for_word(key)
+    if row is None:
+        return None
+    return _row_pron(row.pron, row.pron_bytes) or None
+
+def _prons_for(words) -> Dict[str, List[str]]:
+    """Bulk pron lookup keyed by cleaned word: one IN query instead of one per word."""
+    keys = list({k for k in map(_clean_word, words) if k})
+    out: Dict[str, List[str]] = {}
+    if not keys:
+        return out
+    cols = "word, pron, pron_bytes" if "pron_bytes" in _words_columns() else "word, pron"
+    con = _connect()
+    try:
+        for i in range(0, len(keys), 500):  # stay under SQLite's host-parameter limit
+            chunk = keys[i:i+500]
+            rows = con.execute(f"SELECT {cols} FROM words WHERE word IN ({','.join('?' * len(chunk))})",
+                               chunk).fetchall()
+            for r in rows:
+                out[r[0]] = _row_pron(r[1], r[2] if len(r) > 2 else None)
+    except sqlite3.DatabaseError:
+        pass
+    return out
 
 def phrase_to_pron(phrase: str) -> Optional[List[str]]:
     """Use the final word’s pronunciation as the phrase nucleus."""
@@ -153,11 +251,16 @@ def phrase_to_pron(phrase: str) -> Optional[List[str]]:
 def _derive_keys_from_pron(pron: List[str]) -> Tuple[str,str]:
     if not pron:
         return ("","")
+    # scan from the end: both keys live in the tail, so stop at the
+    # last stressed vowel instead of walking the whole pron
     stressed = lastv = -1
-    for i,t in enumerate(pron):
+    for i in range(len(pron) - 1, -1, -1):
+        t = pron[i]
         if _is_vowel(t):
-            lastv = i
-            if t[-1:] in ("1","2"): stressed = i
+            if lastv == -1: lastv = i
+            if t[-1:] in ("1","2"):
+                stressed = i
+                break
     if stressed == -1: stressed = lastv
     k1 = " ".join(pron[stressed:]) if stressed != -1 else ""
     if lastv == -1:
@@ -176,62 +279,104 @@ def _is_uncommon(word: str) -> bool:
     return z <= _UNCOMMON_ZIPF_MAX
 
 # ----- DB pulls -----
-def _words_by_keys(k1: str, k2: str, limit: int) -> List[Dict[str,Any]]:
+# candidate words must be plain spellings: CMU also lists punctuation names
+# (",comma", ".period"), abbreviations ("a.d.") and digit forms ("3-d")
+_CANDIDATE_WORD_SQL = "word GLOB '[a-z]*' AND word NOT GLOB '*[^a-z''-]*'"
+
+@lru_cache(maxsize=1)
+def _key_index() -> Dict[Tuple[str, str], List[tuple]]:
+    """Whole words table grouped by (k1, k2); loaded once when UR_WORDS_IN_MEMORY=1."""
+    zcol = ", zipf_x100" if "zipf_x100" in _words_columns() else ", NULL"
+    index: Dict[Tuple[str, str], List[tuple]] = {}
+    # same per-key word order the SQL path's ORDER BY word gives, so the caps agree
+    for r in _connect().execute(f"SELECT word, pron, syls, k1, k2{zcol} FROM words "
+                                f"WHERE {_CANDIDATE_WORD_SQL} ORDER BY k1, k2, word"):
+        index.setdefault((r[3], r[4]), []).append(r)
+    return index
+
+@lru_cache(maxsize=512)
+def _key_rows(k1: str, k2: str, limit: int,
+              syllable_min: int, syllable_max: int) -> Tuple[Tuple[Any, ...], ...]:
+    # repeat lookups (same word retyped, rhyming pairs sharing keys) skip the SELECT
+    zcol = ", zipf_x100" if "zipf_x100" in _words_columns() else ", NULL"
+    if _WORDS_IN_MEMORY:
+        rows = [r for r in _key_index().get((k1, k2), ()) if syllable_min <= r[2] <= syllable_max][:limit]
+    else:
+        rows = _connect().execute(
+            f"SELECT word, pron, syls, k1, k2{zcol} FROM words "
+            f"WHERE k1=? AND k2=? AND syls BETWEEN ? AND ? AND {_CANDIDATE_WORD_SQL} ORDER BY word LIMIT ?",
+            (k1, k2, syllable_min, syllable_max, limit)
+        ).fetchall()
+    return tuple(rows)
+
+@lru_cache(maxsize=512)
+def _fused_rows(word: str, limit: int,
+                syllable_min: int, syllable_max: int) -> Tuple[Tuple[Any, ...], ...]:
+    # the query word's keys and its candidates in one statement (one round-trip);
+    # empty when the word is unknown or has blank keys => caller takes the two-step path
+    zcol = "w.zipf_x100" if "zipf_x100" in _words_columns() else "NULL"
+    rows = _connect().execute(
+        "WITH base AS (SELECT k1, k2 FROM words WHERE word=? AND k1<>'' AND k2<>'') "
+        f"SELECT w.word, w.pron, w.syls, w.k1, w.k2, {zcol} FROM base "
+        "JOIN words w ON w.k1=base.k1 AND w.k2=base.k2 "
+        f"WHERE w.syls BETWEEN ? AND ? AND {_CANDIDATE_WORD_SQL} ORDER BY w.word LIMIT ?",
+        (word, syllable_min, syllable_max, limit)
+    ).fetchall()
+    return tuple(rows)
+
+def _candidate_dicts(rows: Tuple[Tuple[Any, ...], ...]) -> List[Dict[str,Any]]:
+    # fresh dicts per call: callers (e.g. _phrase_candidates) mutate them
+    return [{"word": r[0], "pron": r[1], "k1": r[3], "k2": r[4],
+             # precomputed rarity (None => look it up via wordfreq later)
+             "zipf": r[5] / 100.0 if r[5] is not None else None,
+             "is_multiword": 0, "rhyme_type": "perfect", "score": 1.0}
+            for r in rows]
+
+def _words_by_keys(k1: str, k2: str, limit: int,
+                   syllable_min: int = 1, syllable_max: int = 8) -> List[Dict[str,Any]]:
     if not k1 or not k2:
         return []
-    con = _connect()
+    return _candidate_dicts(_key_rows(k1, k2, limit, syllable_min, syllable_max))
+
+@lru_cache(maxsize=1)
+def _io_pool() -> ThreadPoolExecutor:
+    # sqlite3 releases the GIL while it runs a query, so independent DBs overlap
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="ur-io")
+
+def _lyrics_like(path: Path, table: str, q: str, limit: int) -> Tuple[str, ...]:
+    """DISTINCT lyrics containing q from an optional DB (() if missing/broken)."""
+    # checks stay outside the cache: a DB that appears later, or a query that failed
+    # on a transient lock, is retried next time instead of cached as empty
+    if _connect_opt(path) is None:
+        return ()
     try:
-        rows = con.execute(
-            "SELECT word, pron, syls, k1, k2 FROM words WHERE k1=? AND k2=? LIMIT ?",
-            (k1, k2, limit)
-        ).fetchall()
-        out = []
-        for r in rows:
-            try:
-                out.append({"word": r["word"], "pron": r["pron"], "k1": r["k1"], "k2": r["k2"],
-                            "is_multiword": 0, "rhyme_type": "perfect", "score": 1.0})
-            except Exception:
-                out.append({"word": r[0], "pron": r[1], "k1": r[3], "k2": r[4],
-                            "is_multiword": 0, "rhyme_type": "perfect", "score": 1.0})
-        return out
-    finally:
-        con.close()
+        return _lyrics_like_rows(path, table, q, limit)
+    except Exception:
+        return ()
+
+@lru_cache(maxsize=1024)
+def _lyrics_like_rows(path: Path, table: str, q: str, limit: int) -> Tuple[str, ...]:
+    # cached: a LIKE '%q%' is a full scan, and phrase queries repeat as users retype
+    rows = _connect_opt(path).execute(f"SELECT DISTINCT lyric FROM {table} WHERE lyric LIKE ? LIMIT ?",
+                                      (f"%{q}%", limit)).fetchall()
+    return tuple(r[0] for r in rows if r[0])
 
 def _phrase_candidates(q: str, max_cap: int) -> List[Dict[str,Any]]:
     """Pull multiword candidates from patterns/rap; fallback to final-word nucleus if dry."""
     out: List[Dict[str,Any]] = []
-
-    # patterns.sqlite
-    pcon = _connect_opt(PATTERNS_DB)
-    if pcon is not None:
-        try:
-            like = f"%{q}%"
-            rows = pcon.execute("SELECT lyric FROM patterns WHERE lyric LIKE ? LIMIT ?",
-                                (like, max_cap)).fetchall()
-            for r in rows:
-                lyric = r["lyric"] if isinstance(r, sqlite3.Row) else r[0]
-                if lyric:
-                    out.append({"phrase": lyric, "is_multiword": 1, "rhyme_type": "assonant", "score": 0.6})
-        except Exception:
-            pass
-        finally:
-            pcon.close()
-
-    # rap_lines.sqlite
-    rcon = _connect_opt(RAP_DB)
-    if rcon is not None and len(out) < max_cap:
-        try:
-            like = f"%{q}%"
-            rows = rcon.execute("SELECT lyric FROM rap_lines WHERE lyric LIKE ? LIMIT ?",
-                                (like, max_cap - len(out))).fetchall()
-            for r in rows:
-                lyric = r["lyric"] if isinstance(r, sqlite3.Row) else r[0]
-                if lyric:
-                    out.append({"phrase": lyric, "is_multiword": 1, "rhyme_type": "assonant", "score": 0.5})
-        except Exception:
-            pass
-        finally:
-            rcon.close()
+    seen: set = set()  # the same lyric often appears in both sources
+
+    # query patterns.sqlite and rap_lines.sqlite concurrently; patterns rank first
+    pool = _io_pool()
+    pfut = pool.submit(_lyrics_like, PATTERNS_DB, "patterns", q, max_cap)
+    rfut = pool.submit(_lyrics_like, RAP_DB, "rap_lines", q, max_cap)
+    for lyrics, score in ((pfut.result(), 0.6), (rfut.result(), 0.5)):
+        for lyric in lyrics:
+            if len(out) >= max_cap:
+                break
+            if lyric not in seen:
+                seen.add(lyric)
+                out.append({"phrase": lyric, "is_multiword": 1, "rhyme_type": "assonant", "score": score})
 
     # If still dry, use phrase’s final-word nucleus to fetch word candidates and present as phrases
     if not out:
@@ -258,29 +403,23 @@ def _search_flat(query: str,
         return _phrase_candidates(q_clean, min(_MULTIWORD_CAP, cap_internal))
 
     # single word path
+    if not _WORDS_IN_MEMORY and {"k1", "k2"} <= _words_columns():
+        fused = _fused_rows(_clean_word(q_clean), cap_internal, syllable_min, syllable_max)
+        if fused:
+            return _candidate_dicts(fused)
+
+    # two-step path: unknown word, keys to derive, or the in-memory index
     row = _db_row_for_word(q_clean)
     if row is None:
         return []
 
-    v = row["pron"]
-    if isinstance(v, (bytes, bytearray)):
-        try:
-            pron = json.loads(v)
-        except Exception:
-            pron = (v.decode("utf-8", "ignore")).split()
-    elif isinstance(v, str):
-        pron = v.split()
-    elif isinstance(v, list):
-        pron = v
-    else:
-        pron = []
+    pron = _row_pron(row.pron, row.pron_bytes)
 
-    k1 = row.get("k1") if "k1" in row.keys() else ""
-    k2 = row.get("k2") if "k2" in row.keys() else ""
+    k1, k2 = row.k1, row.k2
     if not k1 or not k2:
         k1, k2 = _derive_keys_from_pron(pron)
 
-    return _words_by_keys(k1, k2, cap_internal)
+    return _words_by_keys(k1, k2, cap_internal, syllable_min, syllable_max)
 
 def search_word(query: str,
                 max_results: int = 20,
@@ -289,22 +428,88 @@ def search_word(query: str,
                 syllable_max: int = 8,
                 **kwargs) -> List[Dict[str, Any]]:
     """Flat list API used by tests; returns [{'word': ...}, ...]."""
+    # nothing between the fetch and the slice filters rows, so the first
+    # max_results candidates are all we need to pull (and decode)
     flat = _search_flat(normalize_text(query),
                         include_consonant=include_consonant,
                         syllable_min=syllable_min,
                         syllable_max=syllable_max,
-                        cap_internal=max(2400, max_results * 24))
+                        cap_internal=max_results)
     return flat[:max_results]
 
+def search_words(queries: List[str],
+                 max_results: int = 20,
+                 include_consonant: bool = False,
+                 syllable_min: int = 1,
+                 syllable_max: int = 8) -> Dict[str, List[Dict[str, Any]]]:
+    """Batched search_word: {query: rows}, with one IN query for all the query
+    words' keys and one for all their candidates instead of a round-trip each."""
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    if not _WORDS_IN_MEMORY and {"k1", "k2"} <= _words_columns():
+        clean = {q: _clean_word(normalize_text(q)) for q in queries if " " not in normalize_text(q)}
+        words = list({w for w in clean.values() if w})
+        con = _connect()
+        key_of: Dict[str, Tuple[str, str]] = {}
+        for i in range(0, len(words), 500):  # stay under SQLite's host-parameter limit
+            chunk = words[i:i+500]
+            for r in con.execute(f"SELECT word, k1, k2 FROM words WHERE word IN ({','.join('?' * len(chunk))}) "
+                                 "AND k1<>'' AND k2<>''", chunk):
+                key_of[r[0]] = (r[1], r[2])
+
+        zcol = "w.zipf_x100" if "zipf_x100" in _words_columns() else "NULL"
+        pairs = list(set(key_of.values()))
+        by_key: Dict[Tuple[str, str], List[Tuple[Any, ...]]] = {p: [] for p in pairs}
+        for i in range(0, len(pairs), 250):  # two parameters per pair
+            chunk = pairs[i:i+250]
+            # ROW_NUMBER caps each (k1, k2) group at max_results, in the same
+            # word order search_word's LIMITed pull returns
+            # (joining a VALUES CTE keeps the idx_k1_k2 seek; a row-value IN scans it)
+            rows = con.execute(
+                f"WITH keys(k1, k2) AS (VALUES {','.join(['(?,?)'] * len(chunk))}) "
+                "SELECT word, pron, syls, k1, k2, z FROM ("
+                f"SELECT w.word, w.pron, w.syls, w.k1, w.k2, {zcol} AS z, "
+                "ROW_NUMBER() OVER (PARTITION BY w.k1, w.k2 ORDER BY w.word) AS rn "
+                "FROM keys JOIN words w ON w.k1=keys.k1 AND w.k2=keys.k2 "
+                f"WHERE w.syls BETWEEN ? AND ? AND {_CANDIDATE_WORD_SQL}) WHERE rn <= ?",
+                [k for p in chunk for k in p] + [syllable_min, syllable_max, max_results],
+            ).fetchall()
+            for r in rows:
+                by_key[(r[3], r[4])].append(r)
+        for q, w in clean.items():
+            if w in key_of:
+                out[q] = _candidate_dicts(tuple(by_key[key_of[w]]))
+
+    # phrases, unknown words and keyless rows take the regular per-query path
+    for q in queries:
+        if q not in out:
+            out[q] = search_word(q, max_results, include_consonant, syllable_min, syllable_max)
+    return out
+
+@lru_cache(maxsize=1)
+def _search_pool() -> ThreadPoolExecutor:
+    # long-lived workers, so each keeps (and reuses) its own thread-local connection
+    return ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="ur-search")
+
+def search_many(queries: List[str],
+                max_results: int = 20,
+                include_consonant: bool = False,
+                syllable_min: int = 1,
+                syllable_max: int = 8) -> Dict[str, List[Dict[str, Any]]]:
+    """search_word for many queries on a thread pool; {query: rows}.
+
+    sqlite3 releases the GIL while a statement runs, and the per-worker
+    connections only take shared locks, which any number of readers hold at
+    once in rollback-journal (or WAL) mode, so DB-bound queries overlap."""
+    results = _search_pool().map(
+        lambda q: search_word(q, max_results, include_consonant, syllable_min, syllable_max),
+        queries)
+    return dict(zip(queries, results))
+
 def _to_bucket_item(it: Dict[str,Any]) -> Dict[str,Any]:
     if "phrase" in it:
         return {"phrase": it["phrase"], "type": it.get("rhyme_type","slant"), "score": it.get("score",0.0)}
     return {"name": it.get("word") or it.get("name"), "type": it.get("rhyme_type","perfect"), "score": it.get("score",0.0)}
 
-def _filter_consonant_rows(rows, effective: bool):
-    if effective: return rows
-    return [r for r in rows if r.get("rhyme_type") != "consonant"]
-
 def _effective_include_consonant(flag: bool) -> bool:
     return bool(flag)
 
@@ -317,30 +522,52 @@ def find_rhymes(query: str,
                 include_pron: bool = False,
                 **kwargs) -> Dict[str, List[Dict[str, object]]]:
     """Bucketed API for the UI."""
-    normalized = normalize_text(query)
-    effective_consonant = _effective_include_consonant(include_consonant)
+    cached = _find_rhymes_cached(normalize_text(query), max_results,
+                                 _effective_include_consonant(include_consonant),
+                                 syllable_min, syllable_max,
+                                 os.getenv("UR_TEST_RHYME_FALLBACK","0") == "1")
+    # hand out fresh dicts so callers can't mutate the cached result
+    return {k: [dict(it) for it in v] for k, v in cached.items()}
+
+@lru_cache(maxsize=4096)
+def _find_rhymes_cached(normalized: str,
+                        max_results: int,
+                        effective_consonant: bool,
+                        syllable_min: int,
+                        syllable_max: int,
+                        test_fallback: bool) -> Dict[str, Tuple[Dict[str, object], ...]]:
     flat = _search_flat(normalized,
                         include_consonant=effective_consonant,
                         syllable_min=syllable_min,
                         syllable_max=syllable_max,
                         cap_internal=max(2400, max_results * 24))  # widened
-    flat = _filter_consonant_rows(flat, effective_consonant)
 
     uncommon: List[Dict[str, object]] = []
     slant: List[Dict[str, object]] = []
     multi: List[Dict[str, object]] = []
+    rare: Dict[str, bool] = {}
 
+    # single pass: consonant filtering, bucketing and rarity checks together
     for it in flat:
         typ = str(it.get("rhyme_type","perfect"))
+        if typ == "consonant" and not effective_consonant:
+            continue
         is_multi = bool(it.get("is_multiword"))
         b = _to_bucket_item(it)
 
         if typ == "perfect":
             name = b.get("name")
-            if name and _is_uncommon(name):
+            if name:
+                z = it.get("zipf")
+                rare[name] = _is_uncommon(name) if z is None else z <= _UNCOMMON_ZIPF_MAX
+            if name and rare[name]:
                 uncommon.append(b)
+            elif is_multi:
+                # b also goes to multi as "perfect", so the slant entry needs its own dict
+                slant.append({"name": name, "type":"slant", "score": b.get("score",0.0)})
             else:
-                slant.append({"name": b.get("name"), "type":"slant", "score": b.get("score",0.0)})
+                b["type"] = "slant"  # sole owner of b: relabel in place, no second dict
+                slant.append(b)
         elif typ in ("assonant","slant"):
             slant.append(b)
         elif typ == "consonant":
@@ -357,60 +584,159 @@ def find_rhymes(query: str,
         return (order.get(x.get("type","slant"), 9), -float(x.get("score",0.0)), x.get("name","") or x.get("phrase",""))
     def _km(x): return (-float(x.get("score", 0.0)), x.get("phrase",""))
 
-    uncommon.sort(key=_ku)
-    slant.sort(key=_ks)
-    multi.sort(key=_km)
+    # only the top max_results of each bucket survive, so select them with a
+    # bounded heap (same order as sorted(...)[:n]) instead of full sorts
+    uncommon = heapq.nsmallest(max_results, uncommon, key=_ku)
 
     # Backfill uncommon with rare assonants if under cap
     if len(uncommon) < max_results:
         needed = max_results - len(uncommon)
-        extras = [x for x in slant if x.get("type") in ("assonant","slant") and _is_uncommon(x.get("name",""))]
-        uncommon.extend(extras[:needed])
+        def _rare(n):
+            hit = rare.get(n)
+            return _is_uncommon(n) if hit is None else hit
+        extras = (x for x in slant if x.get("type") in ("assonant","slant") and _rare(x.get("name","")))
+        uncommon.extend(heapq.nsmallest(needed, extras, key=_ks))
+
+    slant = heapq.nsmallest(max_results, slant, key=_ks)
+    multi = heapq.nsmallest(max_results, multi, key=_km)
 
     # Test-only safety net (OFF by default)
-    if not uncommon and not slant and not multi and os.getenv("UR_TEST_RHYME_FALLBACK","0") == "1":
+    if not uncommon and not slant and not multi and test_fallback:
         row = _db_row_for_word(normalized)
-        if row and row.get("k1") and row.get("k2"):
-            con = _connect()
-            try:
-                rows = con.execute(
-                    "SELECT word FROM words WHERE k1=? AND k2=? AND word<>? LIMIT ?",
-                    (row["k1"], row["k2"], row["word"], max_results)
-                ).fetchall()
-                for r in rows:
-                    try:
-                        w = r["word"]
-                    except Exception:
-                        w = r[0]
-                    uncommon.append({"name": w, "type":"perfect", "score": 1.0})
-            finally:
-                con.close()
+        if row and row.k1 and row.k2:
+            rows = _connect().execute(
+                "SELECT word FROM words WHERE k1=? AND k2=? AND word<>? LIMIT ?",
+                (row.k1, row.k2, row.word, max_results)
+            ).fetchall()
+            for r in rows:
+                uncommon.append({"name": r[0], "type":"perfect", "score": 1.0})
 
     return {
-        "uncommon": uncommon[:max_results],
-        "slant": slant[:max_results],
-        "multiword": multi[:max_results],
+        "uncommon": tuple(uncommon[:max_results]),
+        "slant": tuple(slant[:max_results]),
+        "multiword": tuple(multi[:max_results]),
     }
 
 # ===== extra symbols expected by the package =====
-def classify_rhyme(w1: str, w2: str) -> str:
-    """Very simple classifier: perfect if (k1,k2) match, else assonant if vowel_key matches, else slant."""
+@lru_cache(maxsize=8192)
+def _pron_rhyme_keys(pron: Tuple[str, ...]) -> Tuple[str, str, str]:
+    """(k1, k2, vowel_key) straight from phones; no DB round-trip."""
+    k1, k2 = _derive_keys_from_pron(list(pron))
+    return k1, k2, k2.split(" ", 1)[0]
+
+def _match_keys(a: Tuple[Any, Any, Any], b: Tuple[Any, Any, Any]) -> str:
+    k1a, k2a, va = a
+    k1b, k2b, vb = b
+    if k1a and k2a and k1a == k1b and k2a == k2b:
+        return "perfect"
+    if va and va == vb:
+        return "assonant"
+    return "slant"
+
+def _classify_keys(src: Tuple[str, str, str], pron: Any) -> str:
+    """classify_rhyme against pre-derived source keys; lets loops hoist the source side."""
+    if not pron:
+        return "none"
+    return _match_keys(src, _pron_rhyme_keys(tuple(pron)))
+
+# phone ids of the vowels in the encode_phones layout (phone_id << 2 | stress)
+_VOWEL_IDS = frozenset(i for i, p in enumerate(PHONES) if p in VOWELS)
+# bytes decode_phones can't turn back into a canonical token: ids past the inventory,
+# and vowels with stress 3 ("AH3", which the string path doesn't see as a vowel)
+_BAD_PACKED = bytes(b for b in range(256)
+                    if (b >> 2) >= len(PHONES) or ((b >> 2) in _VOWEL_IDS and b & 3 == 3))
+# consonants decode without a stress digit, so their stress bits must not count
+_CANON_PACKED = bytes(b if (b >> 2) in _VOWEL_IDS else b & 0xFC for b in range(256))
+
+@lru_cache(maxsize=65536)
+def _packed_rhyme_keys(blob: bytes) -> Tuple[bytes, bytes, bytes]:
+    """_pron_rhyme_keys on a canonical packed pron (see _pron_blob): the same keys as byte slices.
+
+    A canonical blob and its decode_phones tokens map one-to-one, so comparing these
+    keys gives the same answer as comparing the string keys of the decoded pron.
+    """
+    stressed = lastv = -1
+    for i in range(len(blob) - 1, -1, -1):
+        b = blob[i]
+        if b >> 2 in _VOWEL_IDS:
+            if lastv == -1: lastv = i
+            if (b & 3) in (1, 2):
+                stressed = i
+                break
+    if stressed == -1: stressed = lastv
+    if lastv == -1:
+        return b"", b"", b""
+    vowel = bytes((blob[lastv] & 0xFC,))  # stress bits masked
+    return blob[stressed:], vowel + blob[lastv+1:], vowel
+
+def _canon_blob(blob: bytes) -> Optional[bytes]:
+    if len(blob.translate(None, _BAD_PACKED)) != len(blob):
+        return None
+    return blob.translate(_CANON_PACKED)
+
+def _encode_exact(pron: Any) -> Optional[bytes]:
+    # encode_phones folds "AH"/"AH0" and "T"/"T0" together; only prons that decode back
+    # token-for-token may take the packed path
+    blob = encode_phones(pron)
+    if blob is None or decode_phones(blob) != list(pron):
+        return None
+    return blob
+
+def _pron_blob(x: Any) -> Optional[bytes]:
+    """Canonical packed pron of a blob, pron list or word (b"" if unknown).
+
+    None when the packed keys could disagree with the string keys; callers then
+    compare decoded lists.
+    """
+    if isinstance(x, (bytes, bytearray)):
+        return _canon_blob(bytes(x))
+    if isinstance(x, (list, tuple)):
+        return _encode_exact(x)
+    row = _db_row_for_word(str(x))
+    if row is None:
+        return b""
+    if row.pron_bytes:
+        return _canon_blob(row.pron_bytes)
+    return _encode_exact(_row_pron(row.pron))
+
+def classify_rhyme(w1: Any, w2: Any) -> str:
+    """Very simple classifier: perfect if (k1,k2) match, else assonant if vowel_key matches, else slant.
+
+    Accepts words (looked up in the DB), already-resolved pron lists, or packed
+    prons (encode_phones output, e.g. the words table's pron_bytes).
+    """
+    if isinstance(w1, (bytes, bytearray)) or isinstance(w2, (bytes, bytearray)):
+        # packed fast path: cached byte keys, each compare a bytes equality
+        b1, b2 = _pron_blob(w1), _pron_blob(w2)
+        if b1 is not None and b2 is not None:
+            if not b1 or not b2:
+                return "none"
+            return _match_keys(_packed_rhyme_keys(b1), _packed_rhyme_keys(b2))
+        # a side has phones outside the inventory: compare decoded lists instead
+        if isinstance(w1, (bytes, bytearray)): w1 = decode_phones(w1)
+        if isinstance(w2, (bytes, bytearray)): w2 = decode_phones(w2)
+    if isinstance(w1, (list, tuple)) or isinstance(w2, (list, tuple)):
+        if not isinstance(w1, (list, tuple)): w1 = _get_pron(str(w1)) or []
+        if not isinstance(w2, (list, tuple)): w2 = _get_pron(str(w2)) or []
+        if not w1:
+            return "none"
+        return _classify_keys(_pron_rhyme_keys(tuple(w1)), w2)
     r1 = _db_row_for_word(w1)
     r2 = _db_row_for_word(w2)
     if not r1 or not r2:
         return "none"
-    k1a, k2a = r1.get("k1"), r1.get("k2")
-    k1b, k2b = r2.get("k1"), r2.get("k2")
+    k1a, k2a = r1.k1, r1.k2
+    k1b, k2b = r2.k1, r2.k2
     if k1a and k1b and k2a and k2b and (k1a == k1b) and (k2a == k2b):
         return "perfect"
-    va, vb = r1.get("vowel_key"), r2.get("vowel_key")
+    va, vb = r1.vowel_key, r2.vowel_key
     if va and vb and va == vb:
         return "assonant"
     return "slant"
 
 def syllable_count(x: Any) -> int:
     """Count vowel tokens in a pron or in the pron of a word."""
-    if isinstance(x, list):
+    if isinstance(x, (list, tuple)):
         pron = x
     else:
         pron = _get_pron(str(x)) or []
@@ -418,10 +744,14 @@ def syllable_count(x: Any) -> int:
 
 def stress_pattern_str(x: Any) -> str:
     """Return a simple stress string over vowels only, e.g., '10' or '101'."""
-    if isinstance(x, list):
+    if isinstance(x, (list, tuple)):
         pron = x
     else:
         pron = _get_pron(str(x)) or []
+    return _stress_bits(tuple(pron))
+
+@lru_cache(maxsize=131072)
+def _stress_bits(pron: Tuple[str, ...]) -> str:
     bits: List[str] = []
     for t in pron:
         if _is_vowel(t):
@@ -434,6 +764,8 @@ search = find_rhymes
 
 __all__ = [
     "search_word",
+    "search_words",
+    "search_many",
     "find_rhymes",
     "classify_rhyme",
     "phrase_to_pron",
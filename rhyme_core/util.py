@@ -1 +1,16 @@
 # Small helpers can go here as the project grows.
+from __future__ import annotations
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8192)
+def parse_set(cell: str) -> frozenset:
+    """Items of a " | "-joined benchmark CSV cell, stripped and without blanks."""
+    # cached: conditions that leave a bucket unchanged repeat the baseline cell verbatim
+    if not cell:
+        return frozenset()
+    return frozenset(s for s in map(str.strip, cell.split("|")) if s)
+
+
+__all__ = ["parse_set"]
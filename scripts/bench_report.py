@@ -4,12 +4,13 @@
 
 import argparse
 import csv
+import heapq
 import html
 import logging
-from collections import defaultdict
 from pathlib import Path
 
 from rhyme_core.logging_utils import setup_logging
+from rhyme_core.util import parse_set
 
 setup_logging()
 log = logging.getLogger(__name__)
@@ -21,10 +22,20 @@ BUCKET_COLS = {
     "rap":      "rap_items",
 }
 
-def parse_set(cell: str):
-    if not cell:
-        return set()
-    return set(s.strip() for s in cell.split("|") if s.strip())
+DIFF_CAP = 50  # items listed per added/removed diff; the rest are only counted
+
+_QUERY_TMPL = "<h2>Query: <code>{q}</code></h2>"
+_COND_TMPL = "<div class='cond'><strong>Condition:</strong> <code>{cond}</code></div>"
+_BUCKET_TMPL = "<div class='bucket'><em>{bucket}</em>: "
+_ADD_TMPL = "<span class='add'>{}</span>"
+_REM_TMPL = "<span class='rem'>{}</span>"
+
+def _more(items) -> str:
+    return f" <span class='dim'>… and {len(items) - DIFF_CAP} more</span>" if len(items) > DIFF_CAP else ""
+
+def _spans(tmpl: str, items) -> str:
+    # escape the whole list in one map() pass, then fill the span template
+    return " , ".join(map(tmpl.format, map(html.escape, items)))
 
 def main():
     ap = argparse.ArgumentParser()
@@ -35,61 +46,66 @@ def main():
     with Path(args.csv).open("r", encoding="utf-8") as f:
         rows = list(csv.DictReader(f))
 
-    by_query = defaultdict(dict)
-    for r in rows:
-        by_query[r["query"]][r["condition"]] = r
-
-    parts = []
-    parts.append("<!doctype html><meta charset='utf-8'><title>Uncommon Rhymes – Benchmark Diff</title>")
-    parts.append("<style>body{font-family:system-ui,Segoe UI,Arial,sans-serif;padding:24px;} h2{margin-top:32px} code{background:#f6f8fa;padding:2px 4px;border-radius:3px} .add{color:#0a7;} .rem{color:#c33;} .bucket{margin:6px 0 14px;} .cond{margin:10px 0;} .dim{color:#666} .mono{font-family:ui-monospace, SFMono-Regular, Menlo, Consolas, monospace; font-size:13px;}</style>")
-    parts.append("<h1>Benchmark Diff Report</h1>")
-    parts.append(f"<p class='dim mono'>Source CSV: {html.escape(args.csv)}</p>")
-
-    for q in sorted(by_query.keys()):
-        parts.append(f"<h2>Query: <code>{html.escape(q)}</code></h2>")
-        conds = by_query[q]
-        base = conds.get("baseline")
-        if not base:
-            parts.append("<p class='dim'>No baseline row found.</p>")
-            continue
-
-        baseline_sets = {bucket: parse_set(base[BUCKET_COLS[bucket]]) for bucket in BUCKET_COLS}
-
-        parts.append("<div class='bucket'><strong>Baseline counts</strong>: "
-                     f"Uncommon {base['uncommon_count']}, Slant {base['slant_count']}, "
-                     f"Multi {base['multiword_count']}, Rap {base['rap_count']}. "
-                     f"<span class='dim'>Golden: {html.escape(base.get('golden_status',''))}</span></div>")
-
-        for cond, row in conds.items():
-            if cond == "baseline":
-                continue
-            parts.append(f"<div class='cond'><strong>Condition:</strong> <code>{html.escape(cond)}</code></div>")
-            for bucket, col in BUCKET_COLS.items():
-                cur = parse_set(row[col])
-                base_set = baseline_sets[bucket]
-                added = sorted(cur - base_set)
-                removed = sorted(base_set - cur)
-                if not added and not removed:
-                    continue
-                parts.append(f"<div class='bucket'><em>{bucket.title()}</em>: ")
-                if added:
-                    parts.append(" + " + " , ".join(f"<span class='add'>{html.escape(x)}</span>" for x in added))
-                if removed:
-                    parts.append(" − " + " , ".join(f"<span class='rem'>{html.escape(x)}</span>" for x in removed))
-                parts.append("</div>")
-
-            extra = []
-            if row.get("rap_empty_reason"):
-                extra.append(f"rap_reason={html.escape(row['rap_empty_reason'])}")
-            for ek in ("error_search","error_patterns"):
-                if row.get(ek):
-                    extra.append(f"{ek}={html.escape(row[ek])}")
-            if extra:
-                parts.append(f"<div class='dim mono'>{' | '.join(extra)}</div>")
+    # (query, condition) pivot built once; conditions keep the order benchmark.py ran them in
+    idx = {(r["query"], r["condition"]): r for r in rows}
+    queries = sorted({q for q, _ in idx})
+    conditions = [c for c in dict.fromkeys(r["condition"] for r in rows) if c != "baseline"]
 
     outp = Path(args.out)
     outp.parent.mkdir(parents=True, exist_ok=True)
-    outp.write_text("\n".join(parts), encoding="utf-8")
+    # stream the report out as it is generated instead of joining one big list
+    with outp.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+        def emit(chunk: str) -> None:
+            fh.write(chunk)
+            fh.write("\n")
+
+        emit("<!doctype html><meta charset='utf-8'><title>Uncommon Rhymes – Benchmark Diff</title>")
+        emit("<style>body{font-family:system-ui,Segoe UI,Arial,sans-serif;padding:24px;} h2{margin-top:32px} code{background:#f6f8fa;padding:2px 4px;border-radius:3px} .add{color:#0a7;} .rem{color:#c33;} .bucket{margin:6px 0 14px;} .cond{margin:10px 0;} .dim{color:#666} .mono{font-family:ui-monospace, SFMono-Regular, Menlo, Consolas, monospace; font-size:13px;}</style>")
+        emit("<h1>Benchmark Diff Report</h1>")
+        emit(f"<p class='dim mono'>Source CSV: {html.escape(args.csv)}</p>")
+
+        for q in queries:
+            emit(_QUERY_TMPL.format(q=html.escape(q)))
+            base = idx.get((q, "baseline"))
+            if not base:
+                emit("<p class='dim'>No baseline row found.</p>")
+                continue
+
+            baseline_sets = {bucket: parse_set(base[BUCKET_COLS[bucket]]) for bucket in BUCKET_COLS}
+
+            emit("<div class='bucket'><strong>Baseline counts</strong>: "
+                 f"Uncommon {base['uncommon_count']}, Slant {base['slant_count']}, "
+                 f"Multi {base['multiword_count']}, Rap {base['rap_count']}. "
+                 f"<span class='dim'>Golden: {html.escape(base.get('golden_status',''))}</span></div>")
+
+            for cond in conditions:
+                row = idx.get((q, cond))
+                if row is None:
+                    continue
+                emit(_COND_TMPL.format(cond=html.escape(cond)))
+                for bucket, col in BUCKET_COLS.items():
+                    cur = parse_set(row[col])
+                    base_set = baseline_sets[bucket]
+                    added = cur - base_set
+                    removed = base_set - cur
+                    if not added and not removed:
+                        continue
+                    emit(_BUCKET_TMPL.format(bucket=bucket.title()))
+                    if added:
+                        emit(" + " + _spans(_ADD_TMPL, heapq.nsmallest(DIFF_CAP, added)) + _more(added))
+                    if removed:
+                        emit(" − " + _spans(_REM_TMPL, heapq.nsmallest(DIFF_CAP, removed)) + _more(removed))
+                    emit("</div>")
+
+                extra = []
+                if row.get("rap_empty_reason"):
+                    extra.append(f"rap_reason={html.escape(row['rap_empty_reason'])}")
+                for ek in ("error_search","error_patterns"):
+                    if row.get(ek):
+                        extra.append(f"{ek}={html.escape(row[ek])}")
+                if extra:
+                    emit(f"<div class='dim mono'>{' | '.join(extra)}</div>")
+
     log.info("📄 Wrote HTML report → %s", outp)
 
 if __name__ == "__main__":
@@ -5,10 +5,10 @@
 import argparse
 import csv
 import logging
-from collections import defaultdict
 from pathlib import Path
 
 from rhyme_core.logging_utils import setup_logging
+from rhyme_core.util import parse_set
 
 setup_logging()
 log = logging.getLogger(__name__)
@@ -20,11 +20,6 @@ BUCKET_COLS = {
     "rap":      "rap_items",
 }
 
-def parse_set(cell: str):
-    if not cell:
-        return set()
-    return set(s.strip() for s in cell.split("|") if s.strip())
-
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--csv", default="results/benchmark.csv")
@@ -34,9 +29,10 @@ def main():
     with Path(args.csv).open("r", encoding="utf-8") as f:
         rows = list(csv.DictReader(f))
 
-    by_query = defaultdict(dict)
-    for r in rows:
-        by_query[r["query"]][r["condition"]] = r
+    # (query, condition) pivot built once
+    idx = {(r["query"], r["condition"]): r for r in rows}
+    queries = sorted({q for q, _ in idx})
+    conditions = sorted({c for _, c in idx} - {"baseline"})
 
     total_added = total_removed = 0
     golden_warns = golden_fails = 0
@@ -45,9 +41,8 @@ def main():
     lines = []
     lines.append("## 🔎 Uncommon Rhymes – Benchmark Summary\n")
 
-    for q in sorted(by_query.keys()):
-        conds = by_query[q]
-        base = conds.get("baseline")
+    for q in queries:
+        base = idx.get((q, "baseline"))
         if not base:
             continue
 
@@ -72,8 +67,9 @@ def main():
         flag_str = (" — " + " | ".join(flags)) if flags else ""
         lines.append(f"- Baseline counts: {counts}{flag_str}")
 
-        for cond, row in sorted(conds.items()):
-            if cond == "baseline": continue
+        for cond in conditions:
+            row = idx.get((q, cond))
+            if row is None: continue
             added_any = removed_any = 0
             diffs = []
             for b, col in BUCKET_COLS.items():
@@ -5,9 +5,11 @@
 import argparse
 import csv
 import hashlib
+import heapq
 import importlib
 import json
 import logging
+import multiprocessing
 import os
 import platform
 import random
@@ -15,8 +17,12 @@ import sqlite3
 import subprocess
 import sys
 import time
+import unicodedata as ud
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from rhyme_core.logging_utils import setup_logging
 
@@ -32,13 +38,28 @@ LLM_FLAGS = [
     "UR_LLM_NL_QUERY",
 ]
 
+# CSV column order; run_condition writes row tuples in exactly this order
+FIELDNAMES = (
+    "test_run_id","condition","llm_flag_on","query",
+    "syllables","stress_pattern","metre",
+    "uncommon_count","slant_count","multiword_count","rap_count",
+    "uncommon_items","slant_items","multiword_items","rap_items",
+    "rap_empty_reason","consonant_violation",
+    "latency_ms_search","latency_ms_patterns",
+    "error_prosody","error_search","error_patterns",
+    "provenance","golden_status",
+)
+
 def file_sha256(p: Path) -> str:
     if not p or not p.exists():
         return ""
-    h = hashlib.sha256()
     with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
+        if hasattr(hashlib, "file_digest"):  # 3.11+: the read/update loop runs in C
+            h = hashlib.file_digest(f, "sha256")
+        else:
+            h = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
     return h.hexdigest()[:12]
 
 def get_git_sha() -> str:
@@ -67,9 +88,14 @@ def set_determinism():
     os.environ["UR_LLM_TOP_P"] = "1"
 
 def import_core():
-    # Force clean reload so env toggles take effect
-    for name in list(sys.modules.keys()):
-        if name in ("config", "rhyme_core.search", "rhyme_core.prosody", "rhyme_core.patterns"):
+    # The LLM flags are only read by config (at import), so reloading it is enough
+    # for env toggles to take effect; the core modules (DB connections, caches) are
+    # imported once. UR_FORCE_RELOAD=1 restores a full cold reload per condition.
+    names = ("config", "rhyme_core.search", "rhyme_core.prosody", "rhyme_core.patterns")
+    if os.environ.get("UR_FORCE_RELOAD", "0") != "1":
+        names = ("config",)
+    for name in names:
+        if name in sys.modules:
             importlib.reload(sys.modules[name])
     import config  # type: ignore
     import rhyme_core.search as search  # type: ignore
@@ -77,12 +103,28 @@ def import_core():
     import rhyme_core.patterns as patterns  # type: ignore
     return config, search, prosody, patterns
 
+# search's per-query caches (the schema/pool singletons stay warm). Cleared before
+# every condition so each one times cold lookups, as a fresh --jobs worker does
+_QUERY_CACHES = ("_find_rhymes_cached", "_fused_rows", "_key_rows", "_lyrics_like_rows",
+                 "_db_row_for_clean_word", "_get_pron", "_pron_rhyme_keys",
+                 "_is_uncommon", "_stress_bits")
+
+def clear_query_caches(search_mod) -> None:
+    for name in _QUERY_CACHES:
+        fn = getattr(search_mod, name, None)
+        if hasattr(fn, "cache_clear"):
+            fn.cache_clear()
+
 def prosody_info(prosody_mod, query: str) -> Tuple[Any, Any, Any]:
     syl = getattr(prosody_mod, "syllable_count", lambda x: None)(query)
     stress = getattr(prosody_mod, "stress_pattern_str", lambda x: None)(query)
     metre = getattr(prosody_mod, "metrical_name", lambda x: None)(stress) if stress else None
     return syl, stress, metre
 
+# deterministic tie-breakers (tail/rime, then surface, then rarity desc)
+_SortKey = namedtuple("_SortKey", "tail name neg_rarity item")
+_SORT_FIELDS = attrgetter("tail", "name", "neg_rarity")
+
 def find_all(search_mod, query: str, cap: int) -> Dict[str, List[Dict[str, Any]]]:
     if hasattr(search_mod, "find_rhymes"):
         res = search_mod.find_rhymes(query, max_results=cap, include_consonant=False)
@@ -95,16 +137,23 @@ def find_all(search_mod, query: str, cap: int) -> Dict[str, List[Dict[str, Any]]
         "slant":    res.get("slant") or [],
         "multi":    res.get("multiword") or res.get("multi_word") or [],
     }
-    # Deterministic tie-breakers (tail/rime, then surface, then rarity desc)
     def sort_items(lst, name_key="name"):
-        return sorted(
-            lst,
-            key=lambda it: (
+        # resolve each item's sort fields once, then compare with a C-level attrgetter
+        keyed = [
+            _SortKey(
                 str(it.get("tail_key") or it.get("rime_key") or ""),
                 str(it.get(name_key) or it.get("phrase") or ""),
                 -float(it.get("rarity", 0.0)),
-            ),
-        )[:cap]
+                it,
+            )
+            for it in lst
+        ]
+        if len(keyed) <= cap:
+            keyed.sort(key=_SORT_FIELDS)
+        else:
+            # only the first cap items survive: O(n log cap), same order as sorted()[:cap]
+            keyed = heapq.nsmallest(cap, keyed, key=_SORT_FIELDS)
+        return [k.item for k in keyed]
     out["uncommon"] = sort_items(out["uncommon"])
     out["slant"]    = sort_items(out["slant"])
     out["multi"]    = sort_items(out["multi"], name_key="phrase")
@@ -122,9 +171,10 @@ def rap_patterns_for(patterns_mod, query: str, cap: int) -> List[Dict[str, Any]]
     items = sorted(items, key=lambda r: (str(r.get("source") or ""), str(r.get("target") or ""), str(r.get("context") or "")))[:cap]
     return items
 
+_LLM_OFF = {k: "0" for k in LLM_FLAGS}
+
 def all_llm_off():
-    for k in LLM_FLAGS:
-        os.environ[k] = "0"
+    os.environ.update(_LLM_OFF)
 
 def one_llm_on(flag: str):
     all_llm_off()
@@ -145,15 +195,29 @@ def snapshot_config_env() -> Dict[str, Any]:
 def load_golden(path: Path) -> Dict[str, Any]:
     if not path.exists():
         return {}
+    # JSON sidecar (x.yaml -> x.yaml.json), reused while it is newer than the YAML
+    cache = path.with_suffix(path.suffix + ".json")
+    try:
+        if cache.stat().st_mtime >= path.stat().st_mtime:
+            return json.loads(cache.read_text(encoding="utf-8")) or {}
+    except (OSError, ValueError):
+        pass
     try:
         import yaml  # type: ignore
     except Exception:
         log.warning("PyYAML not installed; skipping golden checks.")
         return {}
+    # libyaml-backed loader when available; same safe semantics, much faster parse
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     try:
-        return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        data = yaml.load(path.read_text(encoding="utf-8"), Loader=loader) or {}
     except Exception:
         return {}
+    try:
+        cache.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    except (OSError, TypeError, ValueError):
+        pass  # read-only checkout or non-JSON YAML types: just skip the sidecar
+    return data
 
 def golden_check(query: str, sets: Dict[str, List[Dict[str, Any]]], g: Dict[str, Any]):
     if query not in g:
@@ -175,28 +239,35 @@ def golden_check(query: str, sets: Dict[str, List[Dict[str, Any]]], g: Dict[str,
         return "WARN", [f"missing_any_of={must_any}"]
     return "OK", []
 
-def run_condition(condition: str, terms: List[str], cap: int, files: Dict[str, Path], goldens: Dict[str, Any], rows: List[Dict[str, Any]], golden_fail: bool):
-    set_determinism()
-    config, search_mod, prosody_mod, patterns_mod = import_core()
-
-    prov = {
+def static_provenance(files: Dict[str, Optional[Path]]) -> Dict[str, Any]:
+    # identical for every condition: hash the data files and probe the platform once per run
+    return {
         "git_sha": get_git_sha(),
         "cmu_hash": file_sha256(files.get("cmu")),
         "patterns_hash": file_sha256(files.get("patterns")),
         "python_version": sys.version.split()[0],
         "platform": platform.platform(),
         "sqlite_version": get_sqlite_version(),
+    }
+
+def run_condition(condition: str, terms: List[str], cap: int, prov_static: Dict[str, Any], goldens: Dict[str, Any], writer: Any, golden_fail: bool) -> int:
+    set_determinism()
+    config, search_mod, prosody_mod, patterns_mod = import_core()
+    clear_query_caches(search_mod)  # outside the timed region
+
+    prov = {
+        **prov_static,
         "config_snapshot": snapshot_config_env(),
         "schema_version": 1
     }
     prov_str = compact_json(prov)
 
+    n = 0
     for q in terms:
         q = q.strip()
         if not q:
             continue
         try:
-            import unicodedata as ud
             qn = ud.normalize("NFC", q)
         except Exception:
             qn = q
@@ -259,32 +330,48 @@ def run_condition(condition: str, terms: List[str], cap: int, files: Dict[str, P
         if golden_fail and golden_state != "OK":
             golden_state = "FAIL"
 
-        rows.append({
-            "test_run_id": str(int(time.time())),
-            "condition": condition,
-            "llm_flag_on": "NONE" if condition == "baseline" else condition,
-            "query": qn,
-            "syllables": syl if syl is not None else "",
-            "stress_pattern": stress or "",
-            "metre": metre or "",
-            "uncommon_count": len(buckets.get("uncommon", [])),
-            "slant_count": len(buckets.get("slant", [])),
-            "multiword_count": len(buckets.get("multi", [])),
-            "rap_count": len(rap),
-            "uncommon_items": uncommon_items,
-            "slant_items": slant_items,
-            "multiword_items": multi_items,
-            "rap_items": rap_items,
-            "rap_empty_reason": rap_empty_reason,
-            "consonant_violation": str(bool(consonant_violation)),
-            "latency_ms_search": latency_ms_search,
-            "latency_ms_patterns": latency_ms_patterns,
-            "error_prosody": error_prosody,
-            "error_search": error_search,
-            "error_patterns": error_patterns,
-            "provenance": prov_str,
-            "golden_status": golden_state if not warns else f"{golden_state}:{','.join(warns)}",
-        })
+        writer.writerow((  # FIELDNAMES order
+            str(int(time.time())),
+            condition,
+            "NONE" if condition == "baseline" else condition,
+            qn,
+            syl if syl is not None else "",
+            stress or "",
+            metre or "",
+            len(buckets.get("uncommon", [])),
+            len(buckets.get("slant", [])),
+            len(buckets.get("multi", [])),
+            len(rap),
+            uncommon_items,
+            slant_items,
+            multi_items,
+            rap_items,
+            rap_empty_reason,
+            str(bool(consonant_violation)),
+            latency_ms_search,
+            latency_ms_patterns,
+            error_prosody,
+            error_search,
+            error_patterns,
+            prov_str,
+            golden_state if not warns else f"{golden_state}:{','.join(warns)}",
+        ))
+        n += 1
+    return n
+
+class _RowBuffer(list):
+    """Collects row tuples in a worker process; quacks like csv.writer for run_condition."""
+    writerow = list.append
+
+def _condition_rows(condition: str, terms: List[str], cap: int, prov_static: Dict[str, Any], goldens: Dict[str, Any], golden_fail: bool) -> List[tuple]:
+    # worker entry point: each spawned child toggles its own LLM flag
+    if condition == "baseline":
+        all_llm_off()
+    else:
+        one_llm_on(condition)
+    rows = _RowBuffer()
+    run_condition(condition, terms, cap=cap, prov_static=prov_static, goldens=goldens, writer=rows, golden_fail=golden_fail)
+    return rows
 
 def main():
     ap = argparse.ArgumentParser()
@@ -293,6 +380,7 @@ def main():
     ap.add_argument("--out", default="results/benchmark.csv")
     ap.add_argument("--cap", type=int, default=20, help="Max items per bucket.")
     ap.add_argument("--golden_fail", action="store_true", help="Mark golden violations as FAIL instead of WARN.")
+    ap.add_argument("--jobs", type=int, default=1, help="Run conditions in this many worker processes (1 = serial).")
     args = ap.parse_args()
 
     Path(args.out).parent.mkdir(parents=True, exist_ok=True)
@@ -315,32 +403,35 @@ def main():
             patterns_db = p
             break
     files = {"cmu": cmu_sqlite if cmu_sqlite.exists() else None, "patterns": patterns_db}
+    prov_static = static_provenance(files)
 
     goldens = load_golden(Path(args.goldens))
-    rows: List[Dict[str, Any]] = []
-
-    all_llm_off()
-    run_condition("baseline", terms, cap=args.cap, files=files, goldens=goldens, rows=rows, golden_fail=args.golden_fail)
-    for flag in LLM_FLAGS:
-        all_llm_off(); os.environ[flag] = "1"
-        run_condition(flag, terms, cap=args.cap, files=files, goldens=goldens, rows=rows, golden_fail=args.golden_fail)
-
-    fieldnames = [
-        "test_run_id","condition","llm_flag_on","query",
-        "syllables","stress_pattern","metre",
-        "uncommon_count","slant_count","multiword_count","rap_count",
-        "uncommon_items","slant_items","multiword_items","rap_items",
-        "rap_empty_reason","consonant_violation",
-        "latency_ms_search","latency_ms_patterns",
-        "error_prosody","error_search","error_patterns",
-        "provenance","golden_status",
-    ]
-    with Path(args.out).open("w", newline="", encoding="utf-8") as cf:
-        w = csv.DictWriter(cf, fieldnames=fieldnames)
-        w.writeheader()
-        w.writerows(rows)
 
-    log.info("✅ Wrote %s rows → %s", len(rows), args.out)
+    # rows stream straight to disk as each query finishes; 1 MiB buffer batches the writes
+    with Path(args.out).open("w", newline="", encoding="utf-8", buffering=1 << 20) as cf:
+        w = csv.writer(cf)
+        w.writerow(FIELDNAMES)
+        conditions = ["baseline", *LLM_FLAGS]
+        if args.jobs > 1:
+            # conditions are independent; spawn (not fork) so each child starts from a clean
+            # env and import state. Rows come back per condition and keep the serial order.
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(args.jobs, len(conditions)), mp_context=ctx) as ex:
+                futs = [ex.submit(_condition_rows, c, terms, args.cap, prov_static, goldens, args.golden_fail)
+                        for c in conditions]
+                n_rows = 0
+                for fut in futs:
+                    rows = fut.result()
+                    w.writerows(rows)
+                    n_rows += len(rows)
+        else:
+            all_llm_off()
+            n_rows = run_condition("baseline", terms, cap=args.cap, prov_static=prov_static, goldens=goldens, writer=w, golden_fail=args.golden_fail)
+            for flag in LLM_FLAGS:
+                one_llm_on(flag)
+                n_rows += run_condition(flag, terms, cap=args.cap, prov_static=prov_static, goldens=goldens, writer=w, golden_fail=args.golden_fail)
+
+    log.info("✅ Wrote %s rows → %s", n_rows, args.out)
     log.info("📝 Logged queries → %s", queries_log)
 
 if __name__ == "__main__":
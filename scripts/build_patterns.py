@@ -5,13 +5,23 @@ from pathlib import Path
 WORDS_DB = Path(os.environ.get("UR_WORDS_DB", "data/words_index.sqlite"))
 PATTERNS = Path(os.environ.get("UR_PATTERNS_DB", "data/patterns.sqlite"))
 
+_NONALPHA = re.compile(r"[^a-z]+")
+# CMU words are ASCII: a C-level translate drops everything but a-z
+_KEEP_LOWER = str.maketrans("", "", "".join(chr(c) for c in range(128) if not 97 <= c <= 122))
+
+def _tail(w: str) -> str:
+    w = w.lower()
+    return w.translate(_KEEP_LOWER) if w.isascii() else _NONALPHA.sub("", w)
+
 def main():
     PATTERNS.parent.mkdir(parents=True, exist_ok=True)
-    conw = sqlite3.connect(str(WORDS_DB)); conw.row_factory = sqlite3.Row
+    conw = sqlite3.connect(str(WORDS_DB))
     conp = sqlite3.connect(str(PATTERNS))
     curp = conp.cursor()
     curp.executescript("""
     PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=OFF;
+    PRAGMA temp_store=MEMORY;
     DROP TABLE IF EXISTS patterns;
     CREATE TABLE patterns(
       key     TEXT PRIMARY KEY,
@@ -21,25 +31,22 @@ def main():
       song    TEXT
     );
     """)
-    rows = conw.execute("SELECT word FROM words").fetchall()
     seen = set()
-    ins = []
-    for r in rows:
-        w = r["word"]
-        tail = re.sub(r"[^a-z]+", "", w.lower())
-        for n in range(3, 7):            # *3..*6 tails
-            if len(tail) >= n:
+
+    def gen():
+        for (w,) in conw.execute("SELECT word FROM words"):
+            tail = _tail(w)[-6:]             # longest tail once; shorter ones slice off it
+            if len(tail) < 3:
+                continue                     # too short for any *3..*6 pattern
+            for n in range(3, len(tail) + 1):   # *3..*6 tails
                 pat = "*" + tail[-n:]
                 key = f"{pat}:{w}"
                 if key in seen: continue
                 seen.add(key)
-                ins.append((key, pat, w, None, None))
-        if len(ins) >= 5000:
-            curp.executemany("INSERT OR REPLACE INTO patterns(key,pattern,lyric,artist,song) VALUES(?,?,?,?,?)", ins)
-            ins.clear()
-    if ins:
-        curp.executemany("INSERT OR REPLACE INTO patterns(key,pattern,lyric,artist,song) VALUES(?,?,?,?,?)", ins)
-    conp.commit()
+                yield (key, pat, w, None, None)
+
+    curp.executemany("INSERT OR REPLACE INTO patterns(key,pattern,lyric,artist,song) VALUES(?,?,?,?,?)", gen())
+    conp.commit()  # single transaction for the whole load
     conw.close(); conp.close()
     print(f"Built patterns with {len(seen)} entries at {PATTERNS}")
 
@@ -2,17 +2,29 @@ import sqlite3
 import os
 import re
 import pathlib
+import sys
+
+# stays runnable as a plain `python scripts/build_words_db.py` from the checkout root:
+# put the repo root on the path so rhyme_core imports without PYTHONPATH=.
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from rhyme_core.phonetics import encode_phones  # noqa: E402
+
+try:
+    from wordfreq import zipf_frequency
+except Exception:  # wordfreq is optional; rarity falls back to query-time lookup
+    zipf_frequency = None
 
 DB_PATH = os.environ.get("WORDS_DB_PATH", "data/words_index.sqlite")
 CMU_PATH = os.environ.get("CMUDICT_PATH", "data/cmudict.txt")
 
-VOWELS = {
+VOWELS = frozenset({
     "AA","AE","AH","AO","AW","AY",
     "EH","ER","EY",
     "IH","IY",
     "OW","OY",
     "UH","UW",
-}
+})
 PAREN_VARIANT_RE = re.compile(r"\(\d+\)$")  # WORD(2) -> WORD
 
 
@@ -20,71 +32,65 @@ def tokens(pron: str):
     return [t for t in pron.split() if t]
 
 
-def is_vowel(tok: str) -> bool:
-    return tok.rstrip("0123456789") in VOWELS
-
-
-def count_syllables(pron: str) -> int:
-    """Count stress digits; good proxy for syllable count in CMUdict."""
-    return sum(ch.isdigit() for ch in pron)
-
-
-def extract_tail_keys(pron: str):
-    """Return (vowel_key, coda_key, rime_key) from last vowel to end."""
-    toks = tokens(pron)
-    if not toks:
-        return ("", "", "")
-    v_idx = -1
-    for i in range(len(toks) - 1, -1, -1):
-        if is_vowel(toks[i]):
-            v_idx = i
-            break
-    if v_idx < 0:
-        coda = "".join(toks)
-        return ("", coda, coda)
-    vowel = toks[v_idx]
-    after = toks[v_idx + 1 :]
-    coda = "".join(after) if after else ""
-    rime = f"{vowel}-{coda}" if coda else vowel
-    return (vowel, coda, rime)
-
-
-def onset_coda_keys(pron: str):
+def parse_pron(pron: str):
     """
-    Heuristic:
+    One pass over the phones -> (toks, syls, k1, k2, vowel_key, coda_key, rime_key).
+
+      - syls: stress digits (good proxy for syllable count in CMUdict)
       - k1: token just before first vowel (or first token if starts with vowel)
       - k2: last token (often final consonant cluster or vowel if no coda)
+      - vowel/coda/rime: from the last vowel to the end
     """
     toks = tokens(pron)
     if not toks:
-        return ("", "")
-    # first vowel index
-    fv = next((i for i, t in enumerate(toks) if is_vowel(t)), None)
-    if fv is None:
-        k1 = toks[0]
-    elif fv == 0:
-        k1 = toks[0]
-    else:
-        k1 = toks[fv - 1]
+        return (toks, 0, "", "", "", "", "")
+    fv = lv = -1
+    syls = 0
+    for i, tok in enumerate(toks):
+        stressed = tok[-1].isdigit()  # CMU stress is a single trailing digit
+        syls += stressed
+        if (tok[:-1] if stressed else tok) in VOWELS:
+            if fv < 0:
+                fv = i
+            lv = i
+    k1 = toks[fv - 1] if fv > 0 else toks[0]
     k2 = toks[-1]
-    return (k1, k2)
+    if lv < 0:
+        coda = "".join(toks)
+        return (toks, syls, k1, k2, "", coda, coda)
+    vowel = toks[lv]
+    coda = "".join(toks[lv + 1 :])
+    rime = f"{vowel}-{coda}" if coda else vowel
+    return (toks, syls, k1, k2, vowel, coda, rime)
+
+
+def zipf_x100(word: str):
+    """wordfreq zipf score x100 (zipf_frequency rounds to hundredths); None without wordfreq."""
+    if zipf_frequency is None:
+        return None
+    return int(round(zipf_frequency(word, "en") * 100))
 
 
 def normalize_word(raw: str) -> str:
     # CMU lines like "WORD(2)  W ER1 D" -> "word"
     w = raw.strip()
-    w = PAREN_VARIANT_RE.sub("", w)
+    if w.endswith(")"):  # only variants carry the suffix; skip the regex otherwise
+        w = PAREN_VARIANT_RE.sub("", w)
     return w.lower()
 
 
 def cmu_lines(path: str):
     """Yield lines from CMUdict handling encoding quirks (utf-8/latin-1)."""
-    with open(path, "rb") as fh:
-        for bline in fh:
-            try:
-                line = bline.decode("utf-8")
-            except UnicodeDecodeError:
-                line = bline.decode("latin-1", errors="ignore")
+    # one buffered text stream; undecodable bytes survive as surrogates so only
+    # the rare bad line pays for the latin-1 fallback
+    with open(path, "r", encoding="utf-8", errors="surrogateescape",
+              newline="", buffering=1 << 20) as fh:
+        for line in fh:
+            if not line.isascii():
+                try:
+                    line.encode("utf-8")
+                except UnicodeEncodeError:
+                    line = line.encode("utf-8", "surrogateescape").decode("latin-1")
             yield line
 
 
@@ -97,6 +103,10 @@ def build():
     cur = con.cursor()
     cur.executescript(
         """
+        -- rebuildable artifact: skip fsyncs and the on-disk rollback journal while loading
+        PRAGMA synchronous=OFF;
+        PRAGMA journal_mode=MEMORY;
+        PRAGMA temp_store=MEMORY;
         DROP TABLE IF EXISTS words;
         CREATE TABLE words(
           word TEXT PRIMARY KEY,
@@ -106,40 +116,47 @@ def build():
           k2   TEXT NOT NULL,
           rime_key  TEXT NOT NULL,
           vowel_key TEXT NOT NULL,
-          coda_key  TEXT NOT NULL
-        );
-        CREATE INDEX IF NOT EXISTS idx_words_word ON words(word);
+          coda_key  TEXT NOT NULL,
+          zipf_x100 INTEGER,
+          pron_bytes BLOB
+        ) WITHOUT ROWID;  -- word is the key: one b-tree, and no separate index on it
         """
     )
 
-    rows = []
     seen = set()
-    for line in cmu_lines(CMU_PATH):
-        if not line or line.startswith(";;;"):
-            continue
-        line = line.rstrip("\r\n")
-        # split into "WORD(alt)  PH ON EMS"
-        parts = line.split("  ", 1)
-        if len(parts) != 2:
-            continue
-        raw_word, pron = parts
-        word = normalize_word(raw_word)
-        if not word or word in seen:
-            continue
-        seen.add(word)
-        syls = count_syllables(pron)
-        k1, k2 = onset_coda_keys(pron)
-        vowel, coda, rime = extract_tail_keys(pron)
-        rows.append((word, pron, syls, k1, k2, rime, vowel, coda))
-        if len(rows) >= 5000:
-            cur.executemany(
-                "INSERT OR REPLACE INTO words VALUES (?,?,?,?,?,?,?,?)", rows
-            )
-            con.commit()
-            rows.clear()
-    if rows:
-        cur.executemany("INSERT OR REPLACE INTO words VALUES (?,?,?,?,?,?,?,?)", rows)
-        con.commit()
+
+    def gen():
+        for line in cmu_lines(CMU_PATH):
+            if not line or line.startswith(";;;"):
+                continue
+            line = line.rstrip("\r\n")
+            # split into "WORD(alt)  PH ON EMS"
+            parts = line.split("  ", 1)
+            if len(parts) != 2:
+                continue
+            raw_word, pron = parts
+            word = normalize_word(raw_word)
+            if not word or word in seen:
+                continue
+            seen.add(word)
+            toks, syls, k1, k2, vowel, coda, rime = parse_pron(pron)
+            yield (word, pron, syls, k1, k2, rime, vowel, coda, zipf_x100(word),
+                   encode_phones(toks))
+
+    # one executemany over the whole stream: no list held, one entry into the C loop
+    cur.executemany("INSERT OR REPLACE INTO words VALUES (?,?,?,?,?,?,?,?,?,?)", gen())
+    con.commit()  # the whole load is one transaction
+
+    # build the lookup indexes once, after the bulk load
+    cur.executescript(
+        """
+        CREATE INDEX IF NOT EXISTS idx_k1_k2 ON words(k1, k2, word, syls, pron, zipf_x100);
+        CREATE INDEX IF NOT EXISTS idx_rime_key ON words(rime_key);
+        CREATE INDEX IF NOT EXISTS idx_vowel_key ON words(vowel_key);
+        CREATE INDEX IF NOT EXISTS idx_coda_key ON words(coda_key);
+        """
+    )
+    con.commit()
 
     n = cur.execute("SELECT COUNT(*) FROM words").fetchone()[0]
     con.close()
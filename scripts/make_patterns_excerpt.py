@@ -15,9 +15,7 @@ def open_db(path: str) -> sqlite3.Connection:
     if not os.path.exists(path):
         log.error("DB not found: %s", path)
         sys.exit(1)
-    con = sqlite3.connect(path)
-    con.row_factory = sqlite3.Row
-    return con
+    return sqlite3.connect(path)
 
 def main():
     ap = argparse.ArgumentParser(description="Create a small excerpt of patterns.db with key columns.")
@@ -43,43 +41,37 @@ def main():
     col_defs = ", ".join(f'"{c}"' for c in cols)
     dcur.executescript(f'CREATE TABLE patterns ({col_defs});')
 
-    # Build excerpt by iterating distinct keys
-    def sample_for_key(col):
-        if col not in cols:
-            return []
-        keys = [r[0] for r in scur.execute(
-            f'SELECT DISTINCT "{col}" FROM {args.table} WHERE "{col}" IS NOT NULL AND "{col}" != ""'
-        ).fetchall()]
-        out = []
-        for k in keys:
-            out += scur.execute(
-                f'SELECT * FROM {args.table} WHERE "{col}"=? LIMIT ?',
-                (k, args.limit_per_key)
-            ).fetchall()
-        return out
+    # Build the whole excerpt in-engine: attach the source and cap rows per key
+    # with a window function instead of round-tripping every row through Python
+    src.close()
+    dcur.execute("ATTACH DATABASE ? AS src", (args.src,))
+    dcur.execute("PRAGMA src.cache_size=-65536")  # 64 MiB: the window sorts scan the source once per key column
+    picks = [
+        f'SELECT rowid FROM (SELECT rowid, ROW_NUMBER() OVER (PARTITION BY "{col}" ORDER BY rowid) AS rn '
+        f"FROM src.{args.table} WHERE \"{col}\" IS NOT NULL AND \"{col}\" != '') WHERE rn <= :cap"
+        for col in dict.fromkeys((args.key1, args.key2)) if col in cols
+    ]
+    n = 0
+    if picks:
+        dcur.execute(
+            f'INSERT INTO patterns SELECT DISTINCT {col_defs} FROM src.{args.table} '
+            f'WHERE rowid IN ({" UNION ".join(picks)}) ORDER BY rowid',
+            {"cap": args.limit_per_key},
+        )
+        n = dcur.rowcount
+    dst.commit()
+    dcur.execute("DETACH DATABASE src")
 
-    rows = sample_for_key(args.key1) + sample_for_key(args.key2)
-    # Dedup rows
-    seen = set(); dedup = []
-    for r in rows:
-        sig = tuple(r[c] for c in cols)
-        if sig in seen: 
-            continue
-        seen.add(sig); dedup.append(r)
-
-    if not dedup:
+    if not n:
         log.error("No rows selected; did you run the migration to add key columns?")
         sys.exit(1)
 
-    placeholders = ",".join(["?"]*len(cols))
-    dcur.executemany(f'INSERT INTO patterns({",".join(cols)}) VALUES ({placeholders})',
-                     [tuple(r[c] for c in cols) for r in dedup])
     # Indexes
     if "last_word_rime_key" in cols:
         dcur.execute('CREATE INDEX IF NOT EXISTS idx_last_word_rime_key ON patterns(last_word_rime_key)')
     if "last_two_syllables_key" in cols:
         dcur.execute('CREATE INDEX IF NOT EXISTS idx_last_two_syllables_key ON patterns(last_two_syllables_key)')
-    dst.commit(); dst.close(); src.close()
-    log.info("[ok] Wrote %s rows to %s with indexes on keys.", len(dedup), args.dst)
+    dst.commit(); dst.close()
+    log.info("[ok] Wrote %s rows to %s with indexes on keys.", n, args.dst)
 if __name__ == "__main__":
     main()
@@ -6,6 +6,7 @@ import logging
 import sqlite3
 from pathlib import Path
 
+from rhyme_core.db_util import ensure_columns, finish, tune
 from rhyme_core.logging_utils import setup_logging
 
 setup_logging()
@@ -28,12 +29,6 @@ def pick_table(cur, preferred: str | None):
 def existing_columns(cur, table: str) -> set[str]:
     return {row[1] for row in cur.execute(f"PRAGMA table_info({table})")}
 
-def ensure_columns(cur, table: str, cols: list[str]):
-    have = existing_columns(cur, table)
-    for col in cols:
-        if col not in have:
-            cur.execute(f"ALTER TABLE {table} ADD COLUMN {col} TEXT")
-
 def ensure_index(cur, table: str, col: str):
     # Only create if the column exists
     have = existing_columns(cur, table)
@@ -51,16 +46,17 @@ def main():
         log.error("DB not found: %s", db_path)
         raise SystemExit(1)
 
-    con = sqlite3.connect(str(db_path))
+    con = tune(sqlite3.connect(str(db_path)))
     try:
-        con.isolation_level = None  # autocommit mode for safety
         cur = con.cursor()
         table = pick_table(cur, args.table)
 
-        # Add optional context columns if missing
+        # Add optional context columns if missing (one transaction for all of them)
+        ensure_columns(con, table, [(c, "TEXT") for c in ("lyric_context", "source_context", "target_context")])
+
+        # Helpful indices (only created if the cols exist), built as a separate pass once the
+        # schema change is done so any later population step can run before them
         cur.execute("BEGIN")
-        ensure_columns(cur, table, ["lyric_context", "source_context", "target_context"])
-        # Helpful indices (only created if the cols exist)
         for k in ("rime_key", "vowel_key", "coda_key"):
             ensure_index(cur, table, k)
         cur.execute("COMMIT")
@@ -75,7 +71,7 @@ def main():
             log.info("Index: %s", idx)
 
     finally:
-        con.close()
+        finish(con)
 
 if __name__ == "__main__":
     main()
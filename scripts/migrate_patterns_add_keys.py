@@ -3,9 +3,12 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import re
 import sqlite3
 import sys
+from functools import lru_cache
 
+from rhyme_core.db_util import ensure_columns, finish, tune
 from rhyme_core.logging_utils import setup_logging
 
 setup_logging()
@@ -16,13 +19,6 @@ def open_db(path: str) -> sqlite3.Connection:
     con.row_factory = sqlite3.Row
     return con
 
-def ensure_columns(cur, table: str, cols):
-    # cols: [(name, type)]
-    existing = {r[1] for r in cur.execute(f"PRAGMA table_info({table})").fetchall()}
-    for name, typ in cols:
-        if name not in existing:
-            cur.execute(f'ALTER TABLE {table} ADD COLUMN {name} {typ}')
-
 def table_exists(cur, table: str) -> bool:
     row = cur.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
@@ -30,6 +26,32 @@ def table_exists(cur, table: str) -> bool:
     ).fetchone()
     return bool(row)
 
+# the UPDATEs call these several times per row, and lyric target words are heavily repeated
+@lru_cache(maxsize=100_000)
+def norm_word(w) -> str:
+    return (w or "").strip().lower()
+
+_PUNCT_RE = re.compile(r"[^a-z'\-]+")
+
+@lru_cache(maxsize=100_000)
+def strip_word(w) -> str:
+    w = norm_word(w)
+    # one C-level regex pass for ASCII words; the per-char loop only for non-ASCII, where
+    # isalpha() also keeps accented letters
+    if w.isascii():
+        return _PUNCT_RE.sub("", w)
+    return "".join(ch for ch in w if ch.isalpha() or ch in "'-")
+
+@lru_cache(maxsize=100_000)
+def canon_key(k):
+    # compact equality key: "IH1|N|D|OW0" whether words stores k1/k2 space-joined
+    # (current builds) or as JSON arrays (legacy builds)
+    if k is None:
+        return None
+    k = k.strip()
+    toks = json.loads(k) if k.startswith("[") else k.split()
+    return "|".join(str(t) for t in toks if t)
+
 def main():
     ap = argparse.ArgumentParser(
         description="Add K1/K2 rhyme keys to a patterns table using words_index.sqlite."
@@ -44,69 +66,106 @@ def main():
                     help="Which column to use for keying (target_word or source_word)")
     ap.add_argument("--limit", type=int, default=0,
                     help="Optional cap for number of rows to process (0 = all)")
+    ap.add_argument("--force", action="store_true",
+                    help="Rekey rows that already have keys (default: only rows without them)")
+    ap.add_argument("--words-in-memory", action="store_true",
+                    help="Copy word/k1/k2 from the words index into memory before keying")
     args = ap.parse_args()
 
-    # Open DBs
-    pcon = open_db(args.patterns)
-    wcon = open_db(args.words)
-    pcur = pcon.cursor(); wcur = wcon.cursor()
+    # Open DBs: the words index is attached so the key join runs inside SQLite
+    pcon = tune(open_db(args.patterns))
+    pcur = pcon.cursor()
 
     # Verify table exists
     if not table_exists(pcur, args.table):
         log.error("Table '%s' was not found in %s", args.table, args.patterns)
+        finish(pcon)
         sys.exit(2)
 
     # Ensure columns exist
-    ensure_columns(pcur, args.table, [
+    ensure_columns(pcon, args.table, [
         ("last_word_rime_key", "TEXT"),
         ("last_two_syllables_key", "TEXT"),
     ])
-    pcon.commit()
 
-    # Prepare queries
-    sel = f'SELECT id, {args.word_col} AS w FROM {args.table}'
+    if args.words_in_memory:
+        # only word/k1/k2 are read, so copy just those into an in-memory schema: the
+        # join's lookups then never touch the words file or compete with the writer's cache
+        pcur.execute("ATTACH DATABASE ':memory:' AS w")
+        pcur.execute("ATTACH DATABASE ? AS wsrc", (args.words,))
+        pcur.execute("CREATE TABLE w.words AS SELECT word, k1, k2 FROM wsrc.words")
+        pcur.execute("CREATE INDEX w.idx_words_word ON words(word)")
+        pcon.commit()
+        pcur.execute("DETACH DATABASE wsrc")
+    else:
+        pcur.execute("ATTACH DATABASE ? AS w", (args.words,))
+    # word normalization stays in Python so it matches the old per-row loop exactly;
+    # deterministic UDFs are evaluated inside the UPDATE's join, with no per-row round-trip
+    pcon.create_function("norm_word", 1, norm_word, deterministic=True)
+    pcon.create_function("strip_word", 1, strip_word, deterministic=True)
+    pcon.create_function("canon_key", 1, canon_key, deterministic=True)
+
+    # reruns only touch rows without keys (O(new rows)); --force rekeys everything,
+    # e.g. after the words index changed
+    todo = "" if args.force else " WHERE last_word_rime_key IS NULL"
+    scope = "" if args.force else " AND p.last_word_rime_key IS NULL"
     if args.limit > 0:
-        sel += f' LIMIT {args.limit}'
-    rows = pcur.execute(sel).fetchall()
-
-    # Words index holds JSON strings for k1/k2 already
-    wsel = "SELECT k1, k2 FROM words WHERE word = ?"
-
-    updated = 0; missing = 0
-    for r in rows:
-        wid = r["id"]; w = (r["w"] or "").strip().lower()
-        if not w:
-            missing += 1
-            continue
-        wrow = wcur.execute(wsel, (w,)).fetchone()
-        if not wrow:
-            # try stripping punctuation (simple heuristic)
-            w2 = "".join(ch for ch in w if ch.isalpha() or ch in "'-").lower()
-            if w2 != w:
-                wrow = wcur.execute(wsel, (w2,)).fetchone()
-        if not wrow:
-            missing += 1
-            continue
-
-        # k1/k2 are already JSON in words_index.sqlite -> copy as-is
-        k1_json = wrow["k1"]
-        k2_json = wrow["k2"]
-        pcur.execute(
-            f'UPDATE {args.table} SET last_word_rime_key=?, last_two_syllables_key=? WHERE id=?',
-            (k1_json, k2_json, wid)
-        )
-        updated += 1
-        if updated % 1000 == 0:
-            pcon.commit()
+        # pin the row set first: the second UPDATE must not re-pick ids the first one keyed
+        pcur.execute("DROP TABLE IF EXISTS temp.todo_ids")
+        pcur.execute(f"CREATE TEMP TABLE todo_ids AS SELECT id FROM {args.table}{todo} LIMIT {int(args.limit)}")
+        scope += " AND p.id IN (SELECT id FROM temp.todo_ids)"
+    total = pcur.execute(
+        f"SELECT COUNT(*) FROM {args.table} AS p WHERE 1{scope}"
+    ).fetchone()[0]
+
+    # drop the key indexes for the bulk UPDATE (every write would rebalance them) and
+    # rebuild them once at the end
+    pcur.execute("DROP INDEX IF EXISTS idx_last_word_rime_key")
+    pcur.execute("DROP INDEX IF EXISTS idx_last_two_syllables_key")
+
+    # one transaction for all the set-based UPDATEs: a single fsync at COMMIT
+    pcur.execute("BEGIN IMMEDIATE")
+    # rows keyed before the "|" form was introduced still hold JSON or space-joined keys,
+    # and the rerun scope below skips them: canonicalize those in place so equality
+    # lookups see one form (canon_key leaves "|"-joined keys unchanged)
+    pcur.execute(f"""
+        UPDATE {args.table}
+           SET last_word_rime_key = canon_key(last_word_rime_key),
+               last_two_syllables_key = canon_key(last_two_syllables_key)
+         WHERE last_word_rime_key LIKE '[%' OR last_word_rime_key LIKE '% %'
+            OR last_two_syllables_key LIKE '[%' OR last_two_syllables_key LIKE '% %'
+    """)
+    recanon = pcur.rowcount
+    # k1/k2 are stored in one canonical "|"-joined form, matching the key indexes' only use (equality)
+    pcur.execute(f"""
+        UPDATE {args.table} AS p
+           SET last_word_rime_key = canon_key(wr.k1), last_two_syllables_key = canon_key(wr.k2)
+          FROM w.words AS wr
+         WHERE wr.word = norm_word(p.{args.word_col}){scope}
+    """)
+    updated = pcur.rowcount
+    # fallback: strip punctuation (simple heuristic) for words with no exact entry
+    pcur.execute(f"""
+        UPDATE {args.table} AS p
+           SET last_word_rime_key = canon_key(wr.k1), last_two_syllables_key = canon_key(wr.k2)
+          FROM w.words AS wr
+         WHERE wr.word = strip_word(p.{args.word_col})
+           AND strip_word(p.{args.word_col}) != norm_word(p.{args.word_col})
+           AND NOT EXISTS (SELECT 1 FROM w.words AS x WHERE x.word = norm_word(p.{args.word_col})){scope}
+    """)
+    updated += pcur.rowcount
+    missing = total - updated
 
     pcon.commit()
+    pcur.execute("DETACH DATABASE w")
     # Indexes for fast lookup
     pcur.execute(f'CREATE INDEX IF NOT EXISTS idx_last_word_rime_key ON {args.table}(last_word_rime_key)')
     pcur.execute(f'CREATE INDEX IF NOT EXISTS idx_last_two_syllables_key ON {args.table}(last_two_syllables_key)')
     pcon.commit()
 
-    log.info("[ok] Updated rows: %s; missing keys: %s", updated, missing)
-    pcon.close(); wcon.close()
+    log.info("[ok] Updated rows: %s; missing keys: %s; legacy keys canonicalized: %s",
+             updated, missing, recanon)
+    finish(pcon)
 
 if __name__ == "__main__":
     main()
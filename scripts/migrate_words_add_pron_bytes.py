@@ -0,0 +1,70 @@
+# scripts/migrate_words_add_pron_bytes.py
+from __future__ import annotations
+
+import argparse
+import logging
+import sqlite3
+import sys
+
+from rhyme_core.db_util import ensure_columns, finish, tune
+from rhyme_core.logging_utils import setup_logging
+from rhyme_core.phonetics import encode_phones, parse_pron_field
+
+setup_logging()
+log = logging.getLogger(__name__)
+
+def main():
+    ap = argparse.ArgumentParser(description="Add packed phone-ID pronunciations to words_index.sqlite")
+    ap.add_argument("--db", default="data/words_index.sqlite", help="Path to words_index.sqlite")
+    ap.add_argument("--limit", type=int, default=0, help="Process only N rows (0 = all)")
+    args = ap.parse_args()
+
+    con = tune(sqlite3.connect(args.db, cached_statements=256))
+    cur = con.cursor()
+
+    tabs = [r[0] for r in cur.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()]
+    if "words" not in tabs:
+        log.error("No 'words' table found in %s", args.db)
+        finish(con)
+        sys.exit(2)
+
+    ensure_columns(con, "words", [("pron_bytes", "BLOB")])
+
+    base = "SELECT word, pron FROM words WHERE pron_bytes IS NULL"
+    if args.limit > 0:
+        base += f" LIMIT {args.limit}"
+
+    # stream the SELECT on its own cursor while `cur` writes (same connection, so the
+    # reader never holds a lock against the writer)
+    rd = con.cursor()
+    rd.execute(base)
+    seen = 0; skipped = 0
+    upd = "UPDATE words SET pron_bytes=? WHERE word=?"
+    batch = []
+
+    while True:
+        chunk = rd.fetchmany(5000)
+        if not chunk:
+            break
+        seen += len(chunk)
+        for word, pron in chunk:
+            blob = encode_phones(parse_pron_field(pron))
+            if not blob:
+                # unknown phone or empty pron: store an empty blob, which readers already
+                # treat as "use the text column", so reruns (and --limit) don't reselect it
+                skipped += 1
+                blob = b""
+            batch.append((blob, word))
+        if len(batch) >= 5000:
+            cur.executemany(upd, batch)
+            batch.clear()
+
+    if batch:
+        cur.executemany(upd, batch)
+
+    con.commit()
+    log.info("[ok] updated=%s, skipped=%s", seen - skipped, skipped)
+    finish(con)
+
+if __name__ == "__main__":
+    main()
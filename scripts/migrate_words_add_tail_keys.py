@@ -3,86 +3,110 @@ from __future__ import annotations
 
 import argparse
 import logging
+import multiprocessing
 import sqlite3
 import sys
+from functools import lru_cache
 
+from rhyme_core.db_util import ensure_columns, finish, tune
 from rhyme_core.logging_utils import setup_logging
 from rhyme_core.phonetics import parse_pron_field, tail_keys
 
 setup_logging()
 log = logging.getLogger(__name__)
 
-def ensure_columns(cur: sqlite3.Cursor):
-    # Add columns if missing
-    cols = {r[1] for r in cur.execute("PRAGMA table_info(words)").fetchall()}
-    if "rime_key" not in cols:
-        cur.execute("ALTER TABLE words ADD COLUMN rime_key TEXT")
-    if "vowel_key" not in cols:
-        cur.execute("ALTER TABLE words ADD COLUMN vowel_key TEXT")
-    if "coda_key" not in cols:
-        cur.execute("ALTER TABLE words ADD COLUMN coda_key TEXT")
-
 def index_sql(cur: sqlite3.Cursor):
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rime_key ON words(rime_key)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_vowel_key ON words(vowel_key)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_coda_key ON words(coda_key)")
 
+@lru_cache(maxsize=200_000)
+def _keys(pron_raw) -> tuple[str, str, str]:
+    # keyed on the raw pron string: homographs and shared tails repeat it often,
+    # and a hit skips both the parse and the tail scan
+    return tail_keys(parse_pron_field(pron_raw))
+
+def _work(row):
+    word, pron_raw = row
+    vowel, coda, rime = _keys(pron_raw)
+    if not any((vowel, coda, rime)):
+        return None
+    return (rime, vowel, coda, word)
+
 def main():
     ap = argparse.ArgumentParser(description="Add tail-based rhyme keys to words_index.sqlite")
     ap.add_argument("--db", default="data/words_index.sqlite", help="Path to words_index.sqlite")
     ap.add_argument("--limit", type=int, default=0, help="Process only N rows (0 = all)")
     ap.add_argument("--where", default="", help="Optional WHERE clause (e.g. \"word like 's%' \")")
+    ap.add_argument("--force", action="store_true", help="Recompute keys for rows that already have them")
+    ap.add_argument("--workers", type=int, default=1, help="Processes computing keys (1 = in-process)")
     args = ap.parse_args()
 
-    con = sqlite3.connect(args.db)
-    con.row_factory = sqlite3.Row
+    con = tune(sqlite3.connect(args.db))
     cur = con.cursor()
 
     # sanity check
     tabs = [r[0] for r in cur.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()]
     if "words" not in tabs:
         log.error("No 'words' table found in %s", args.db)
+        finish(con)
         sys.exit(2)
 
-    ensure_columns(cur)
-    con.commit()
+    ensure_columns(con, "words", [("rime_key", "TEXT"), ("vowel_key", "TEXT"), ("coda_key", "TEXT")])
 
-    base = "SELECT rowid, word, pron FROM words"
+    # reruns only touch rows without keys (O(new rows)); --force recomputes everything
+    conds = [] if args.force else ["(rime_key IS NULL OR rime_key = '')"]
     if args.where:
-        base += " WHERE " + args.where
+        conds.append(f"({args.where})")
+    base = "SELECT word, pron FROM words"
+    if conds:
+        base += " WHERE " + " AND ".join(conds)
     if args.limit > 0:
         base += f" LIMIT {args.limit}"
 
-    rows = cur.execute(base).fetchall()
+    # stream the SELECT on its own cursor while `cur` writes: same connection, so the
+    # reader never holds a lock against the writer (a second connection would).
+    # Rows are plain tuples, so they unpack positionally and pickle to worker processes.
+    rd = con.cursor()
+    rd.execute(base)
     updated = 0; skipped = 0
-
-    for i, r in enumerate(rows, 1):
-        w = r["word"]
-        try:
-            pron_raw = r["pron"]
-        except Exception:
-            pron_raw = []
-
-        phones = parse_pron_field(pron_raw)
-        vowel, coda, rime = tail_keys(phones)
-
-        if not any((vowel, coda, rime)):
-            skipped += 1
-            continue
-
-        cur.execute("UPDATE words SET rime_key=?, vowel_key=?, coda_key=? WHERE rowid=?",
-                    (rime, vowel, coda, r["rowid"]))
-        updated += 1
-
-        if updated % 5000 == 0:
-            con.commit()
+    upd = "UPDATE words SET rime_key=?, vowel_key=?, coda_key=? WHERE word=?"
+    batch = []
+
+    # key derivation is pure CPU: with --workers > 1 it fans out to a process pool while
+    # this process stays the only SQLite reader/writer (chunks are fetched here, so the
+    # pool's feeder thread never touches the connection)
+    pool = multiprocessing.Pool(args.workers) if args.workers > 1 else None
+    try:
+        while True:
+            chunk = rd.fetchmany(5000)
+            if not chunk:
+                break
+            results = pool.imap_unordered(_work, chunk, chunksize=256) if pool else map(_work, chunk)
+            for res in results:
+                if res is None:
+                    skipped += 1
+                    continue
+                batch.append(res)
+            if len(batch) >= 5000:
+                cur.executemany(upd, batch)
+                updated += len(batch)
+                batch.clear()
+    finally:
+        if pool:
+            pool.close(); pool.join()
+
+    if batch:
+        cur.executemany(upd, batch)
+        updated += len(batch)
 
     con.commit()
     index_sql(cur)
     con.commit()
 
+    _keys.cache_clear()
     log.info("[ok] updated=%s, skipped=%s", updated, skipped)
-    con.close()
+    finish(con)
 
 if __name__ == "__main__":
     main()
@@ -1,61 +1,75 @@
 # scripts/migrate_words_db.py
 import os
 import sqlite3
-from contextlib import closing
+from functools import lru_cache
 
+from rhyme_core.db_util import ensure_columns, finish, tune
 from rhyme_core.phonetics import parse_pron_field, tail_keys
 
 DB_PATH = os.environ.get("WORDS_DB_PATH", "data/words_index.sqlite")
 
-def ensure_columns(con: sqlite3.Connection) -> list[str]:
-    have = {row[1] for row in con.execute("PRAGMA table_info(words)").fetchall()}
-    needed = ["rime_key", "vowel_key", "coda_key"]
-    missing = [c for c in needed if c not in have]
-    for col in missing:
-        con.execute(f"ALTER TABLE words ADD COLUMN {col} TEXT")
-    if missing:
-        con.commit()
-    return missing
+@lru_cache(maxsize=None)
+def _tail(pron) -> tuple[str, str, str]:
+    # (vowel, coda, rime); cached because many words share a pron tail and the UPDATE
+    # asks for each of the three parts separately
+    return tail_keys(parse_pron_field(pron))
+
+_NEEDS_KEYS = """
+    ((rime_key IS NULL OR rime_key = '')
+     OR (vowel_key IS NULL OR vowel_key = '')
+     OR (coda_key  IS NULL OR coda_key  = ''))
+"""
 
-def backfill(con: sqlite3.Connection, batch_size: int = 1000) -> int:
-    cur = con.cursor()
-    cur.execute("""
-        SELECT rowid, pron
-        FROM words
-        WHERE (rime_key IS NULL OR rime_key = '')
-           OR (vowel_key IS NULL OR vowel_key = '')
-           OR (coda_key  IS NULL OR coda_key  = '')
+def backfill(con: sqlite3.Connection) -> tuple[int, int]:
+    # one transaction for the whole backfill: a single fsync at COMMIT
+    # derive the keys inside SQLite's VM: a single UPDATE calling deterministic UDFs,
+    # no per-row SELECT/UPDATE round-trips. (Generated columns are not an option:
+    # ALTER TABLE cannot add STORED ones, and a VIRTUAL one would need these UDFs
+    # registered on every connection that reads words.)
+    con.create_function("tail_vowel", 1, lambda p: _tail(p)[0], deterministic=True)
+    con.create_function("tail_coda", 1, lambda p: _tail(p)[1], deterministic=True)
+    con.create_function("tail_rime", 1, lambda p: _tail(p)[2], deterministic=True)
+    con.execute("BEGIN IMMEDIATE")
+    # rows with no pron have no keys to derive: filter them in SQL (never calling the
+    # UDFs) and count them once up front instead
+    skipped = con.execute(f"""
+        SELECT COUNT(*) FROM words
+        WHERE {_NEEDS_KEYS} AND (pron IS NULL OR length(trim(pron)) = 0)
+    """).fetchone()[0]
+    cur = con.execute(f"""
+        UPDATE words
+        SET rime_key = tail_rime(pron), vowel_key = tail_vowel(pron), coda_key = tail_coda(pron)
+        WHERE {_NEEDS_KEYS} AND pron IS NOT NULL AND length(trim(pron)) > 0
     """)
-    rows = cur.fetchall()
-    total = 0
-    for i in range(0, len(rows), batch_size):
-        chunk = rows[i:i+batch_size]
-        updates = []
-        for rowid, pron in chunk:
-            phones = parse_pron_field(pron)
-            vowel, coda, rime = tail_keys(phones)
-            updates.append((rime, vowel, coda, rowid))
-        cur.executemany(
-            "UPDATE words SET rime_key=?, vowel_key=?, coda_key=? WHERE rowid=?",
-            updates
-        )
-        con.commit()
-        total += len(updates)
-    return total
+    total = cur.rowcount
+    con.commit()
+    return total, skipped
 
 def main():
     if not os.path.exists(DB_PATH):
         raise SystemExit(f"DB not found: {DB_PATH}. Build or provide data/words_index.sqlite first.")
-    with closing(sqlite3.connect(DB_PATH)) as con:
-        con.row_factory = sqlite3.Row
-        missing = ensure_columns(con)
-        updated = backfill(con)
-        con.execute("CREATE INDEX IF NOT EXISTS idx_words_word ON words(word)")
+    con = tune(sqlite3.connect(DB_PATH))
+    try:
+        missing = ensure_columns(con, "words", [("rime_key", "TEXT"), ("vowel_key", "TEXT"), ("coda_key", "TEXT")])
+        # the backfill writes the indexed key columns: drop their indexes and rebuild once after
+        con.execute("DROP INDEX IF EXISTS idx_words_word")  # duplicated the word PRIMARY KEY
+        for idx in ("idx_rime_key", "idx_vowel_key", "idx_coda_key"):
+            con.execute(f"DROP INDEX IF EXISTS {idx}")
+        updated, skipped = backfill(con)
         con.execute("CREATE INDEX IF NOT EXISTS idx_rime_key ON words(rime_key)")
         con.execute("CREATE INDEX IF NOT EXISTS idx_vowel_key ON words(vowel_key)")
         con.execute("CREATE INDEX IF NOT EXISTS idx_coda_key ON words(coda_key)")
+        # the search's (k1, k2) candidate pull needs this covering index; older DBs were
+        # built without it, and the read path no longer creates it on first use
+        cols = {r[1] for r in con.execute("PRAGMA table_info(words)")}
+        if {"k1", "k2"} <= cols:
+            covered = [c for c in ("word", "syls", "pron", "zipf_x100") if c in cols]
+            con.execute(f"CREATE INDEX IF NOT EXISTS idx_k1_k2 ON words(k1, k2, {', '.join(covered)})")
         con.commit()
-    print(f"Migration complete. Added columns: {missing or 'none'}. Rows updated: {updated}.")
+    finally:
+        finish(con)
+    _tail.cache_clear()
+    print(f"Migration complete. Added columns: {missing or 'none'}. Rows updated: {updated}. Skipped (no pron): {skipped}.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,40 @@
+import sqlite3
+
+from rhyme_core.db_util import ensure_columns, finish, tune
+
+
+def test_tune_switches_to_wal_and_keeps_connection_usable(tmp_path):
+    con = tune(sqlite3.connect(tmp_path / "t.sqlite"))
+    assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert con.execute("PRAGMA cache_size").fetchone()[0] == -262144
+    con.execute("CREATE TABLE t(x)")
+    con.execute("INSERT INTO t VALUES (1)")
+    con.commit()
+    assert con.execute("SELECT x FROM t").fetchall() == [(1,)]
+    assert not (tmp_path / "t.sqlite-shm").exists()  # exclusive lock taken before WAL
+    con.close()
+
+
+def test_finish_leaves_the_file_out_of_wal(tmp_path):
+    path = tmp_path / "t.sqlite"
+    con = tune(sqlite3.connect(path))
+    con.execute("CREATE TABLE t(x)")
+    con.execute("INSERT INTO t VALUES (1)")
+    con.commit()
+    finish(con)
+    assert not (tmp_path / "t.sqlite-wal").exists()
+    con = sqlite3.connect(path)
+    assert con.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert con.execute("SELECT x FROM t").fetchall() == [(1,)]
+    con.close()
+
+
+def test_ensure_columns_adds_only_missing_and_reports_them():
+    con = sqlite3.connect(":memory:")
+    con.execute("CREATE TABLE words(word TEXT, rime_key TEXT)")
+    cols = [("rime_key", "TEXT"), ("vowel_key", "TEXT"), ("pron_bytes", "BLOB")]
+    assert ensure_columns(con, "words", cols) == ["vowel_key", "pron_bytes"]
+    have = [r[1] for r in con.execute("PRAGMA table_info(words)")]
+    assert have == ["word", "rime_key", "vowel_key", "pron_bytes"]
+    assert not con.in_transaction
+    assert ensure_columns(con, "words", cols) == []
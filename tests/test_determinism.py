@@ -1,6 +1,8 @@
 import os, importlib
 from pathlib import Path
 
+import pytest
+
 def reload_core():
     for name in list(__import__('sys').modules.keys()):
         if name in ("config","rhyme_core.search","rhyme_core.prosody","rhyme_core.patterns"):
@@ -8,12 +10,16 @@ def reload_core():
     import rhyme_core.search as search
     return search
 
-def run_once(q):
+@pytest.fixture(autouse=True, scope="module")
+def search_fn():
+    # env is identical for every query, so set it and reload the core modules once
     os.environ["UR_LLM_TEMPERATURE"]="0"; os.environ["UR_LLM_TOP_P"]="1"
     os.environ["UR_LLM_RERANK"]=os.environ["UR_LLM_PATTERN_RERANK"]=os.environ["UR_LLM_OOV_G2P"]="0"
     os.environ["UR_LLM_PHRASE_GEN"]=os.environ["UR_LLM_MULTIWORD_MINE"]=os.environ["UR_LLM_NL_QUERY"]="0"
     search = reload_core()
-    fn = getattr(search,"find_rhymes",None) or getattr(search,"search",None)
+    return getattr(search,"find_rhymes",None) or getattr(search,"search",None)
+
+def run_once(fn, q):
     res = fn(q, max_results=20, include_consonant=False)
     # normalize
     perf = tuple(sorted((x.get("name","") for x in res.get("uncommon",[]) or res.get("perfect",[]))))
@@ -21,9 +27,9 @@ def run_once(q):
     mult = tuple(sorted((x.get("phrase","") for x in res.get("multiword",[]) or res.get("multi_word",[]))))
     return perf, slnt, mult
 
-def test_three_runs_identical():
+def test_three_runs_identical(search_fn):
     for q in Path("data/test_terms.txt").read_text(encoding="utf-8").splitlines():
         q=q.strip()
         if not q: continue
-        r1, r2, r3 = run_once(q), run_once(q), run_once(q)
+        r1, r2, r3 = run_once(search_fn, q), run_once(search_fn, q), run_once(search_fn, q)
         assert r1 == r2 == r3, f"Non-deterministic for query: {q}"
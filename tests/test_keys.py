@@ -3,3 +3,36 @@ from rhyme_core.phonetics import key_k1, key_k2
 def test_import():
     assert callable(key_k1)
     assert callable(key_k2)
+
+def test_classify_rhyme_on_prons():
+    from rhyme_core.search import classify_rhyme
+    assert classify_rhyme(["K", "AE1", "T"], ["HH", "AE1", "T"]) == "perfect"
+    assert classify_rhyme(["K", "AE1", "T"], ["M", "AE1", "P"]) == "assonant"
+    assert classify_rhyme(["K", "AE1", "T"], ["D", "AO1", "G"]) == "slant"
+    assert classify_rhyme(["K", "AE1", "T"], []) == "none"
+
+def test_classify_rhyme_on_packed_prons():
+    from rhyme_core.phonetics import encode_phones
+    from rhyme_core.search import classify_rhyme
+    cat = encode_phones(["K", "AE1", "T"])
+    assert classify_rhyme(cat, encode_phones(["HH", "AE1", "T"])) == "perfect"
+    assert classify_rhyme(cat, ["M", "AE1", "P"]) == "assonant"
+    assert classify_rhyme(["D", "AO1", "G"], cat) == "slant"
+    assert classify_rhyme(cat, b"") == "none"
+
+
+def test_packed_and_list_paths_agree():
+    import random
+    from rhyme_core.phonetics import PHONES, decode_phones, encode_phones
+    from rhyme_core.search import classify_rhyme
+    rng = random.Random(7)
+    # digitless vowels and stray-digit consonants are spellings encode_phones folds together
+    toks = [v + d for v in ("AH", "AE", "IY") for d in ("", "0", "1", "2")] + ["T", "T0", "N", "S1"]
+    for _ in range(3000):
+        a = [rng.choice(toks) for _ in range(rng.randint(1, 4))]
+        b = [rng.choice(toks) for _ in range(rng.randint(1, 4))]
+        # a packed pron means its decode_phones tokens, on either side and for any byte
+        for packed in (encode_phones(a), bytes(rng.randrange(len(PHONES) << 2) for _ in range(3))):
+            assert classify_rhyme(packed, b) == classify_rhyme(decode_phones(packed), b)
+            assert classify_rhyme(b, packed) == classify_rhyme(b, decode_phones(packed))
+    assert classify_rhyme(["AH", "T"], encode_phones(["AH0", "T"])) == "assonant"
@@ -1,4 +1,4 @@
-from rhyme_core.phonetics import parse_pron_field, tail_keys
+from rhyme_core.phonetics import decode_phones, encode_phones, parse_pron_field, tail_keys
 
 
 def test_parse_pron_field_accepts_json_string():
@@ -16,3 +16,11 @@ def test_parse_pron_field_accepts_whitespace_string():
 def test_tail_keys_with_and_without_coda():
     assert tail_keys(["T", "AE1", "K"]) == ("AE1", "K", "AE1-K")
     assert tail_keys(["W", "OW1"]) == ("OW1", "", "OW1")
+
+
+def test_encode_decode_phones_roundtrip():
+    phones = ["S", "IH1", "S", "T", "ER0"]
+    blob = encode_phones(phones)
+    assert len(blob) == len(phones)
+    assert decode_phones(blob) == phones
+    assert encode_phones(["XX1"]) is None